@@ -0,0 +1,66 @@
+"""
+Time the solve_ivp methods of the coupled ecosystem model for each kind of
+forcing, and their deviation from a tight-tolerance reference run.
+
+The forcings cover the cases whose cost differs: none, a smooth seasonal
+flowering cycle, and annual one-month pesticide pulses with and without
+flowering. Pulses multiply the number of right-hand side evaluations, so
+the forcing rather than the run length sets the cost of a run.
+
+Run from the repository root:
+
+    python benchmarks/bench_coupled_solver.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.models import create_coupled_simulation
+
+COLUMNS = ['biodiversity', 'crop_production', 'wild_plants', 'bee_population']
+METHODS = ['LSODA', 'BDF', 'Radau']
+YEARS = 50
+
+
+def _forcings(years):
+    """Pesticide mortality and flowering series of each benchmark case."""
+    t = np.linspace(0, years, years * 12)
+    pulses = np.where(np.arange(len(t)) % 12 == 3, 2.0, 0.0)  # One month a year
+    flowering = 1 + 0.5 * np.sin(2 * np.pi * t)
+    return {
+        'no forcing': (None, None),
+        'flowering 0.5': (None, flowering),
+        'pulse 2.0': (pulses, None),
+        'pulse 2.0, flowering 0.5': (pulses, flowering)
+    }
+
+
+def _best_time(func, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    print(f"{YEARS}-year runs, bee population 60 %, resilience 0.6")
+    for case, (pesticide, flowering) in _forcings(YEARS).items():
+        reference = create_coupled_simulation(60, YEARS, 0.6, pesticide, flowering, rtol=1e-8)
+        print(case)
+        for method in METHODS:
+            elapsed, (df, solution) = _best_time(lambda: create_coupled_simulation(
+                60, YEARS, 0.6, pesticide, flowering, method=method, return_solution=True
+            ))
+            error = np.abs(df[COLUMNS].values - reference[COLUMNS].values).max()
+            print(f"  {method:<6} {elapsed:6.3f} s  {solution.nfev:6d} evaluations  "
+                  f"max deviation {error:.1e} percentage points")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,45 @@
+"""
+Time the economic impact cube against the slider rerun budget, and the
+summary of one region and crop type read by the metric cards.
+
+Run from the repository root:
+
+    python benchmarks/bench_economics.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.data_module import get_initial_data
+from core.economics import cube_frame, economic_cube, summarize_cube
+from core.scenarios import CROP_TYPE_CROPS
+from core.spatial import region_departments, simulate_regions
+
+
+def _best_time(func, repeat=50):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    crops = get_initial_data()['crops']
+    for years in (10, 50):
+        simulation = simulate_regions(60, years, 0.6)
+        cube = economic_cube(simulation, crops)
+        regions = region_departments(simulation, "Zona Cafetera")
+
+        cube_time = _best_time(lambda: economic_cube(simulation, crops))
+        summary_time = _best_time(lambda: summarize_cube(cube, regions, CROP_TYPE_CROPS["Café"]))
+        frame_time = _best_time(lambda: cube_frame(cube), repeat=10)
+        print(f"{years} years, cube {cube['economic_loss'].shape}: economic_cube {cube_time * 1e3:.2f} ms, "
+              f"summarize_cube {summary_time * 1e3:.3f} ms, cube_frame {frame_time * 1e3:.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
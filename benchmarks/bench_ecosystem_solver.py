@@ -0,0 +1,53 @@
+"""
+Compare the closed-form ecosystem solver against odeint, both for speed and
+for agreement within tolerance.
+
+Run from the repository root:
+
+    python benchmarks/bench_ecosystem_solver.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.models import create_ecosystem_simulation
+
+COLUMNS = ['biodiversity', 'crop_production', 'wild_plants', 'bee_population']
+TOLERANCE = 1e-4  # Percentage points
+
+
+def _best_time(func, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    worst = 0.0
+    for bee_percentage in range(10, 101, 5):
+        for resilience in (0.2, 0.4, 0.6, 0.8, 1.0):
+            for years in (1, 10, 50):
+                analytic = create_ecosystem_simulation(bee_percentage, years, resilience, solver='analytic')
+                numeric = create_ecosystem_simulation(bee_percentage, years, resilience, solver='odeint')
+                error = np.abs(analytic[COLUMNS].values - numeric[COLUMNS].values).max()
+                worst = max(worst, error)
+
+    print(f"Max deviation from odeint: {worst:.2e} percentage points (tolerance {TOLERANCE:.0e})")
+    if worst > TOLERANCE:
+        sys.exit("Analytic solver disagrees with odeint")
+
+    analytic_time = _best_time(lambda: create_ecosystem_simulation(40, 50, 0.6, solver='analytic'))
+    numeric_time = _best_time(lambda: create_ecosystem_simulation(40, 50, 0.6, solver='odeint'))
+    print(f"50-year run: analytic {analytic_time * 1e3:.2f} ms, odeint {numeric_time * 1e3:.2f} ms "
+          f"({numeric_time / analytic_time:.0f}x)")
+
+
+if __name__ == '__main__':
+    main()
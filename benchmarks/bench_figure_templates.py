@@ -0,0 +1,76 @@
+"""
+Compare building the Plotly figures from scratch on every interaction
+against reusing the cached static templates and only adding the dynamic
+traces.
+
+The templates only save construction time: both figures serialize to the
+same JSON, whose trace arrays are already base64 typed arrays and whose
+size is mostly the layout. The JSON size and serialization time are printed
+to show that they do not change.
+
+Run from the repository root:
+
+    python benchmarks/bench_figure_templates.py
+"""
+import json
+import os
+import sys
+import time
+
+import plotly.graph_objects as go
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import visualizations as v
+
+
+def _mean_ms(func, repeat=30):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1e3
+
+
+def _full_build(template_builder, public_builder, template_args, call_args):
+    """Rebuild the static template and attach the dynamic parts, as before templates."""
+    template = template_builder.__wrapped__(*template_args)
+    dynamic = public_builder(*call_args)
+    fig = go.Figure(template)
+    for trace in dynamic.data[len(template['data']):]:
+        fig.add_trace(trace)
+    fig.frames = dynamic.frames
+    return fig
+
+
+CASES = [
+    ('plot_bee_crop_relationship', v._bee_crop_relationship_template,
+     v.plot_bee_crop_relationship, (), (40,)),
+    ('plot_bee_crop_relationship_3d', v._bee_crop_relationship_3d_template,
+     v.plot_bee_crop_relationship_3d, (10, (40, 20)), (40, 10)),
+    ('plot_biodiversity_impact_3d', v._biodiversity_impact_3d_template,
+     v.plot_biodiversity_impact_3d, ((30, 30), False), (40, 0.6)),
+]
+
+
+def main():
+    print(f"{'figure':<32}{'full ms':>10}{'template ms':>13}{'speedup':>9}"
+          f"{'json kB':>9}{'json full ms':>14}{'json tmpl ms':>14}")
+    for name, template_builder, public_builder, template_args, call_args in CASES:
+        public_builder(*call_args)  # Warm the template cache
+
+        full = _mean_ms(lambda: _full_build(template_builder, public_builder, template_args, call_args))
+        templated = _mean_ms(lambda: public_builder(*call_args))
+
+        full_fig = _full_build(template_builder, public_builder, template_args, call_args)
+        templated_fig = public_builder(*call_args)
+        payload = templated_fig.to_json()
+        assert json.loads(payload) == json.loads(full_fig.to_json()), name
+        json_full = _mean_ms(full_fig.to_json)
+        json_templated = _mean_ms(templated_fig.to_json)
+
+        print(f"{name:<32}{full:>10.2f}{templated:>13.2f}{full / templated:>8.1f}x"
+              f"{len(payload) / 1e3:>9.1f}{json_full:>14.2f}{json_templated:>14.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+"""
+Measure the cold import time and memory of the app modules with
+`python -X importtime` and check which heavy dependencies each of them loads.
+
+Every module is imported in a fresh interpreter. The heavy dependencies
+(pandas, scipy, folium, plotly.express, streamlit_folium, streamlit) must
+only be imported when a DataFrame, solver, figure or map is built; the
+modules of the `core` package may load none of them. Importing a module may
+load at most the heavy dependencies listed for it in ALLOWED_HEAVY; the
+script exits with an error otherwise. 'main.py (header)' runs the imports at the top of main.py,
+i.e. what a cold container loads before the first element is drawn.
+
+Run from the repository root:
+
+    python benchmarks/bench_import_time.py
+"""
+import ast
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_MODULES = ['pandas', 'scipy', 'folium', 'plotly.express', 'streamlit_folium', 'streamlit']
+
+# Heavy dependencies each import may load
+ALLOWED_HEAVY = {
+    'core.models': [],
+    'core.data_module': [],
+    'core.spatial': [],
+    'core.scenarios': [],
+    'core.economics': [],
+    'core.region_store': [],
+    'core.parallel': [],
+    'core.instrumentation': [],
+    'core.surfaces': [],
+    'core.uncertainty': [],
+    'core.batch': [],
+    'data.regions': [],
+    'cache': [],
+    'utils': [],
+    'visualizations': [],
+    'main.py (header)': ['streamlit']
+}
+
+
+def _main_header():
+    """Source of the top-level imports of main.py before its first statement."""
+    with open(os.path.join(ROOT, 'main.py'), encoding='utf-8') as f:
+        source = f.read()
+    lines = []
+    for node in ast.parse(source).body:
+        if not isinstance(node, (ast.Import, ast.ImportFrom)):
+            break
+        lines.append(ast.get_source_segment(source, node))
+    return '\n'.join(lines)
+
+
+def _import_time(statement):
+    """
+    Cumulative import time and peak memory of `statement` in a fresh interpreter.
+
+    Returns:
+    --------
+    tuple
+        (seconds, peak RSS in MB, list of the HEAVY_MODULES that were imported)
+    """
+    report_rss = "import resource; print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)"
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f"{statement}\n{report_rss}"],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    total = 0
+    loaded = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line.split('|')
+        module = name.strip()
+        # Top-level entries have no indentation; nested ones are in their parent's total
+        if name[1] != ' ':
+            total += int(cumulative)
+        loaded.update(heavy for heavy in HEAVY_MODULES if module == heavy)
+    return total / 1e6, int(result.stdout.split()[-1]) / 1024, sorted(loaded)
+
+
+def main():
+    statements = {name: f"import {name}" for name in ALLOWED_HEAVY if not name.endswith(')')}
+    statements['main.py (header)'] = _main_header()
+
+    failures = []
+    print(f"{'module':<20} {'import':>9} {'RSS':>8}  heavy dependencies loaded")
+    for name, statement in statements.items():
+        seconds, rss, loaded = _import_time(statement)
+        unexpected = sorted(set(loaded) - set(ALLOWED_HEAVY[name]))
+        if unexpected:
+            failures.append(f"{name} imports {', '.join(unexpected)}")
+        print(f"{name:<20} {seconds * 1e3:7.0f} ms {rss:5.0f} MB  {', '.join(loaded) or '-'}")
+
+    for name in HEAVY_MODULES:
+        seconds, rss, _ = _import_time(f"import {name}")
+        print(f"{'(' + name + ')':<20} {seconds * 1e3:7.0f} ms {rss:5.0f} MB")
+
+    if failures:
+        sys.exit("Eager heavy imports: " + "; ".join(failures))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+"""
+Compare the size of the generated map HTML when regions are drawn as one
+GeoJSON layer against one Marker, Circle and Popup object per region.
+
+Run from the repository root:
+
+    python benchmarks/bench_map_layers.py
+"""
+import os
+import sys
+import time
+
+import folium
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from visualizations import RISK_COLORS, _risk_circle_radius, region_popup_html, risk_marker_layer
+
+RISK_LEVELS = ["Alto", "Medio", "Bajo"]
+
+
+def _regions(n_regions, rng):
+    return [
+        {'name': f"Región {i}", 'lat': round(float(lat), 4), 'lon': round(float(lon), 4),
+         'risk': RISK_LEVELS[i % 3], 'dependency': int(dependency),
+         'crops': "Café, frutas, cacao", 'description': "Cultivos con dependencia de polinizadores"}
+        for i, (lat, lon, dependency) in enumerate(zip(
+            rng.uniform(-4.2, 12.4, n_regions), rng.uniform(-79.0, -67.0, n_regions),
+            rng.integers(0, 101, n_regions)
+        ))
+    ]
+
+
+def _per_region_objects(regions, m):
+    """The previous rendering: separate Folium objects per region."""
+    for region in regions:
+        color = RISK_COLORS[region['risk']]
+        folium.Marker(
+            location=[region['lat'], region['lon']],
+            popup=folium.Popup(region_popup_html(region), max_width=300),
+            tooltip=f"{region['name']} - Riesgo: {region['risk']}",
+            icon=folium.Icon(color=color, icon='leaf', prefix='fa')
+        ).add_to(m)
+        folium.Circle(
+            radius=region['dependency'] * 500, location=[region['lat'], region['lon']],
+            color=color, fill=True, fill_opacity=0.2, opacity=0.6, weight=1
+        ).add_to(m)
+
+
+def _render(build):
+    m = folium.Map(location=[4.5709, -74.2973], zoom_start=6)
+    build(m)
+    start = time.perf_counter()
+    html = m.get_root().render()
+    return len(html), html.count('L.'), time.perf_counter() - start
+
+
+def main():
+    rng = np.random.default_rng(0)
+    for n_regions in (15, 200, 2000):
+        regions = _regions(n_regions, rng)
+        radius = _risk_circle_radius(60)
+        results = {
+            'per-region objects': _render(lambda m: _per_region_objects(regions, m)),
+            'GeoJSON with popups': _render(lambda m: risk_marker_layer(regions, radius).add_to(m)),
+            'GeoJSON, lazy popups': _render(lambda m: risk_marker_layer(regions, radius, popups=False).add_to(m)),
+            'FastMarkerCluster': _render(lambda m: risk_marker_layer(regions, radius, clustered=True).add_to(m))
+        }
+        print(f"{n_regions} regions")
+        for name, (size, objects, elapsed) in results.items():
+            print(f"  {name:<20} {size / 1e3:8.1f} kB  {objects:6d} Leaflet calls  render {elapsed * 1e3:7.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+"""
+Time the metapopulation model on a municipality-sized grid and check that the
+dispersal coupling stays sparse.
+
+Run from the repository root:
+
+    python benchmarks/bench_metapopulation.py [n_nodes]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.spatial import dispersal_matrix, simulate_metapopulation
+
+# Bounding box of mainland Colombia
+LAT_RANGE = (-4.2, 12.4)
+LON_RANGE = (-79.0, -67.0)
+RADIUS_KM = 50.0
+
+
+def main():
+    n_nodes = int(sys.argv[1]) if len(sys.argv) > 1 else 1100
+    rng = np.random.default_rng(0)
+    lat = rng.uniform(*LAT_RANGE, n_nodes)
+    lon = rng.uniform(*LON_RANGE, n_nodes)
+    decline_rates = rng.uniform(1.8, 3.1, n_nodes)
+    bee_percentage = rng.uniform(30, 90, n_nodes)
+
+    start = time.perf_counter()
+    weights = dispersal_matrix(lat, lon, RADIUS_KM)
+    build_time = time.perf_counter() - start
+
+    sparse_bytes = weights.data.nbytes + weights.indices.nbytes + weights.indptr.nbytes
+    dense_bytes = n_nodes * n_nodes * 8
+    print(f"{n_nodes} nodes, {weights.nnz} couplings ({weights.nnz / n_nodes:.1f} per node)")
+    print(f"Dispersal matrix: {sparse_bytes / 1e3:.0f} kB sparse vs {dense_bytes / 1e6:.1f} MB dense, "
+          f"built in {build_time * 1e3:.1f} ms")
+
+    for years in (10, 50):
+        start = time.perf_counter()
+        result = simulate_metapopulation(
+            bee_percentage, years, 0.6, lat, lon, decline_rates, radius_km=RADIUS_KM
+        )
+        elapsed = time.perf_counter() - start
+        print(f"{years}-year monthly run: {elapsed:.2f} s, states {result['states'].shape}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+"""
+Throughput of core.parallel and of the batch runner for increasing worker
+counts, with the speedup and parallel efficiency relative to one worker.
+
+Two workloads are timed: numeric integrations of declining bee populations
+(one odeint run per scenario, the case the process pool is for) and a
+core.batch run over a scenario CSV, whose chunks are simulated by the same
+pool while the parent builds and writes the result tables. Speedups are
+bounded by the number of CPUs of the machine.
+
+Run from the repository root:
+
+    python benchmarks/bench_parallel_scaling.py [workers ...]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.batch import run_batch
+from core.parallel import run_parallel_simulations
+
+N_INTEGRATIONS = 512
+N_BATCH_SCENARIOS = 100000
+YEARS = 10
+
+
+def _worker_counts():
+    if len(sys.argv) > 1:
+        return [int(value) for value in sys.argv[1:]]
+    cpus = os.cpu_count() or 1
+    counts = [1]
+    while counts[-1] * 2 <= max(cpus, 2):
+        counts.append(counts[-1] * 2)
+    return counts
+
+
+def _best_time(func, repeat=3):
+    # The best of a few runs, so the first-call costs of the inline path
+    # (imports, solver setup) do not count against one worker
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _report(name, n_scenarios, timings):
+    print(name)
+    baseline = timings[0][1]
+    for workers, elapsed in timings:
+        speedup = baseline / elapsed
+        print(f"  {workers:3d} workers {elapsed:7.2f} s  {n_scenarios / elapsed:9.0f} scenarios/s  "
+              f"speedup {speedup:5.2f}  efficiency {speedup / workers:4.0%}")
+
+
+def main():
+    counts = _worker_counts()
+    print(f"{os.cpu_count()} CPUs")
+    rng = np.random.default_rng(0)
+
+    bee = rng.uniform(30, 100, N_INTEGRATIONS)
+    resilience = rng.uniform(0.2, 1.0, N_INTEGRATIONS)
+    decline = np.linspace(1, 0.5, YEARS * 12)
+    trajectories = bee[:, np.newaxis] * decline
+    timings = [
+        (workers, _best_time(lambda: run_parallel_simulations(
+            bee, resilience, YEARS, bee_trajectories=trajectories, solver='odeint',
+            workers=workers, chunk_size=16
+        )))
+        for workers in counts
+    ]
+    _report(f"run_parallel_simulations, {N_INTEGRATIONS} odeint runs of {YEARS} years", N_INTEGRATIONS, timings)
+
+    import pandas as pd
+
+    with tempfile.TemporaryDirectory() as directory:
+        input_path = os.path.join(directory, 'scenarios.csv')
+        pd.DataFrame({
+            'bee_percentage': rng.uniform(10, 100, N_BATCH_SCENARIOS),
+            'resilience': rng.uniform(0.2, 1.0, N_BATCH_SCENARIOS),
+            'years': rng.integers(1, 51, N_BATCH_SCENARIOS)
+        }).to_csv(input_path, index=False)
+
+        output_path = os.path.join(directory, 'results.csv')
+        timings = [
+            (workers, _best_time(lambda: run_batch(input_path, output_path, workers=workers), repeat=2))
+            for workers in counts
+        ]
+        _report(f"core.batch, {N_BATCH_SCENARIOS} scenarios to CSV", N_BATCH_SCENARIOS, timings)
+
+
+if __name__ == '__main__':
+    main()
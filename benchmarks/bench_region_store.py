@@ -0,0 +1,84 @@
+"""
+Compare RegionStore queries against the list comprehension filtering used by
+the map page, on a synthetic farm-level point set.
+
+Run from the repository root:
+
+    python benchmarks/bench_region_store.py [n_points]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data.regions import build_region_table, load_region_table, save_region_table
+from core.region_store import RegionStore
+
+RISK_LEVELS = ["Alto", "Medio", "Bajo"]
+
+
+def _best_time(func, repeat=20):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    n_points = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    rng = np.random.default_rng(0)
+    records = [
+        {'name': f"Punto {i}", 'lat': round(float(lat), 4), 'lon': round(float(lon), 4), 'risk': str(risk),
+         'dependency': int(dependency), 'crops': "Café, frutas", 'description': ""}
+        for i, (lat, lon, risk, dependency) in enumerate(zip(
+            rng.uniform(-4.2, 12.4, n_points), rng.uniform(-79.0, -67.0, n_points),
+            rng.choice(RISK_LEVELS, n_points), rng.integers(0, 101, n_points)
+        ))
+    ]
+
+    start = time.perf_counter()
+    store = RegionStore(build_region_table(records))
+    print(f"{n_points} points converted and indexed in {(time.perf_counter() - start) * 1e3:.0f} ms")
+
+    with tempfile.TemporaryDirectory() as directory:
+        save_region_table(store.table, directory)
+        start = time.perf_counter()
+        loaded = load_region_table(directory)
+        load_time = time.perf_counter() - start
+        print(f"Memory-mapped table loaded in {load_time * 1e3:.2f} ms "
+              f"({sum(values.nbytes for values in loaded.columns.values()) / 1e6:.1f} MB of columns)")
+        del loaded
+
+    # Roughly the Eje Cafetero viewport at zoom 9
+    bounds = (4.3, -76.2, 5.6, -75.0)
+    risk = ["Alto"]
+    threshold = 80
+
+    def scan():
+        return [
+            record for record in records
+            if record['risk'] in risk and record['dependency'] >= threshold
+            and bounds[0] <= record['lat'] <= bounds[2] and bounds[1] <= record['lon'] <= bounds[3]
+        ]
+
+    expected = scan()
+    indexed = store.filter(risk=risk, min_dependency=threshold, bounds=bounds)
+    if indexed != expected:
+        sys.exit("Indexed query disagrees with the linear scan")
+
+    scan_time = _best_time(scan)
+    query_time = _best_time(lambda: store.query(risk=risk, min_dependency=threshold, bounds=bounds))
+    bounds_time = _best_time(lambda: store.in_bounds(*bounds))
+    print(f"{len(expected)} matches: linear scan {scan_time * 1e3:.2f} ms, "
+          f"indexed query {query_time * 1e3:.2f} ms ({scan_time / query_time:.0f}x), "
+          f"viewport only {bounds_time * 1e3:.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,131 @@
+"""
+Benchmark the original scalar models, looped over a grid, against the
+vectorized array API of the crop production and biodiversity models, and the
+crop-resolved production model at FAOSTAT scale against a scalar call.
+
+Run from the repository root:
+
+    python benchmarks/bench_vectorized_models.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.models import calculate_crop_production, calculate_crop_production_by_crop, calculate_biodiversity_impact
+
+
+def _original_crop_production(bee_percentage):
+    """The scalar calculate_crop_production before vectorization."""
+    bee_dependent_percentage = 0.35
+    bee_norm = bee_percentage / 100
+    if bee_norm >= 0.8:
+        bee_crop_factor = 1.0
+    elif bee_norm >= 0.5:
+        bee_crop_factor = 0.8 + ((bee_norm - 0.5) / 0.3) * 0.2
+    elif bee_norm >= 0.2:
+        bee_crop_factor = 0.4 + ((bee_norm - 0.2) / 0.3) * 0.4
+    else:
+        bee_crop_factor = bee_norm / 0.2 * 0.4
+    crop_production_factor = (bee_dependent_percentage * bee_crop_factor) + \
+                             ((1 - bee_dependent_percentage) * 1.0)
+    return crop_production_factor * 100
+
+
+def _original_biodiversity_impact(bee_percentage, ecosystem_resilience):
+    """The scalar calculate_biodiversity_impact before vectorization."""
+    bee_norm = bee_percentage / 100
+    adjusted_bee = bee_norm + (ecosystem_resilience * 0.3)
+    biodiversity_factor = 1 / (1 + np.exp(-5 * (adjusted_bee - 0.5)))
+    return min(biodiversity_factor * 100, 100)
+
+
+def _per_point(func, n_points, repeat=3):
+    """Return the best per-point time in nanoseconds over `repeat` runs."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best / n_points * 1e9
+
+
+def _best(func, repeat=200):
+    """Return the best time in microseconds over `repeat` runs."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1e6
+
+
+def bench_crops(n_crops=5000):
+    rng = np.random.default_rng(0)
+    dependence = rng.uniform(0, 1, n_crops)
+    value = rng.uniform(1, 10, n_crops)
+    bee_levels = np.arange(10, 101, 5)
+
+    scalar = _best(lambda: _original_crop_production(55))
+    aggregate = _best(lambda: calculate_crop_production_by_crop(55, dependence, value, per_crop=False))
+    matrix = _best(lambda: calculate_crop_production_by_crop(bee_levels, dependence, value))
+
+    print(f"\n{n_crops:,} crops")
+    print(f"{'original calculate_crop_production (scalar)':<48}{scalar:>10.2f} us")
+    print(f"{'by_crop aggregate, 1 bee level':<48}{aggregate:>10.2f} us")
+    print(f"{'by_crop per-crop matrix, 19 bee levels':<48}{matrix:>10.2f} us")
+
+
+def main():
+    # 1000 x 1000 grid = 10^6 points
+    bee_grid, resilience_grid = np.meshgrid(
+        np.linspace(0, 100, 1000), np.linspace(0.2, 1.0, 1000)
+    )
+    n_points = bee_grid.size
+
+    # The scalar loop is timed on a sample and extrapolated per point
+    sample = 20000
+    bee_sample = bee_grid.ravel()[:sample]
+    resilience_sample = resilience_grid.ravel()[:sample]
+
+    # Plain Python floats, as the sliders pass them
+    bee_sample = bee_sample.tolist()
+    resilience_sample = resilience_sample.tolist()
+
+    crop_loop = _per_point(
+        lambda: [_original_crop_production(b) for b in bee_sample], sample, repeat=3
+    )
+    crop_scalar = _per_point(
+        lambda: [calculate_crop_production(b) for b in bee_sample], sample, repeat=3
+    )
+    crop_vec = _per_point(lambda: calculate_crop_production(bee_grid), n_points)
+
+    bio_loop = _per_point(
+        lambda: [_original_biodiversity_impact(b, r)
+                 for b, r in zip(bee_sample, resilience_sample)],
+        sample, repeat=3
+    )
+    bio_scalar = _per_point(
+        lambda: [calculate_biodiversity_impact(b, r)
+                 for b, r in zip(bee_sample, resilience_sample)],
+        sample, repeat=3
+    )
+    bio_vec = _per_point(
+        lambda: calculate_biodiversity_impact(bee_grid, resilience_grid), n_points
+    )
+
+    print(f"Grid size: {n_points:,} points")
+    print(f"{'function':<32}{'original loop':>14}{'scalar call':>13}{'array':>9}{'speedup':>9}   (ns/pt)")
+    print(f"{'calculate_crop_production':<32}{crop_loop:>14.1f}{crop_scalar:>13.1f}{crop_vec:>9.2f}"
+          f"{crop_loop / crop_vec:>8.0f}x")
+    print(f"{'calculate_biodiversity_impact':<32}{bio_loop:>14.1f}{bio_scalar:>13.1f}{bio_vec:>9.2f}"
+          f"{bio_loop / bio_vec:>8.0f}x")
+
+    bench_crops()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,418 @@
+"""
+Memoization layer for model outputs and figure builders.
+
+The Streamlit pages re-run from the top on every widget interaction, but the
+slider inputs only take a small set of discrete values. The helpers here
+quantize those inputs onto the slider grid and keep the resulting model
+outputs and fully built figures in bounded LRU caches with hit/miss counters.
+
+The caches are plain module-level objects guarded by a lock, so they persist
+across Streamlit reruns and sessions (modules are imported once per server
+process) and work the same when the modules are imported headless.
+
+Cached values are shared between callers and must be treated as read-only.
+"""
+import copy
+import functools
+import inspect
+import math
+import threading
+from collections import OrderedDict
+
+# Discrete values offered by the sliders in main.py
+BEE_PERCENTAGE_STEP = 5
+BEE_PERCENTAGE_RANGE = (10, 100)
+YEARS_RANGE = (1, 50)
+RESILIENCE_LEVELS = (0.2, 0.4, 0.6, 0.8, 1.0)
+# Finest grid (degrees) onto which map viewports are widened
+VIEWPORT_MIN_STEP = 2.0 ** -6
+
+_registry = {}
+
+
+def quantize_bee_percentage(bee_percentage):
+    """
+    Snap a bee population percentage to the nearest slider step.
+
+    Parameters:
+    -----------
+    bee_percentage : float
+        Percentage of bee population (0-100)
+
+    Returns:
+    --------
+    int
+        Bee percentage rounded to a multiple of 5 within 10-100
+    """
+    low, high = BEE_PERCENTAGE_RANGE
+    snapped = int(round(bee_percentage / BEE_PERCENTAGE_STEP)) * BEE_PERCENTAGE_STEP
+    return min(high, max(low, snapped))
+
+
+def quantize_years(years):
+    """
+    Snap a simulation horizon to a whole number of years within 1-50.
+
+    Parameters:
+    -----------
+    years : int
+        Number of years to simulate
+
+    Returns:
+    --------
+    int
+        Years clipped to the slider range
+    """
+    low, high = YEARS_RANGE
+    return min(high, max(low, int(round(years))))
+
+
+def quantize_resilience(ecosystem_resilience):
+    """
+    Snap an ecosystem resilience factor to the nearest of the five levels.
+
+    Parameters:
+    -----------
+    ecosystem_resilience : float
+        Ecosystem resilience factor (0-1)
+
+    Returns:
+    --------
+    float
+        Closest value in RESILIENCE_LEVELS
+    """
+    return min(RESILIENCE_LEVELS, key=lambda level: abs(level - ecosystem_resilience))
+
+
+def quantize_bounds(bounds):
+    """
+    Widen a map viewport outwards to a grid scaled to its size.
+
+    The grid step is a power of two of about a quarter of the larger side
+    of the viewport, so small pans and the sub-pixel jitter of the bounds
+    st_folium returns map to the same key at every zoom level.
+
+    Parameters:
+    -----------
+    bounds : tuple of float or None
+        (south, west, north, east) in degrees
+
+    Returns:
+    --------
+    tuple of float or None
+        Grid-aligned bounds containing `bounds`, or None for None
+    """
+    if bounds is None:
+        return None
+    south, west, north, east = bounds
+    span = max(north - south, east - west, VIEWPORT_MIN_STEP)
+    step = max(2.0 ** math.floor(math.log2(span / 4)), VIEWPORT_MIN_STEP)
+    return (
+        math.floor(south / step) * step,
+        math.floor(west / step) * step,
+        math.ceil(north / step) * step,
+        math.ceil(east / step) * step
+    )
+
+
+class LRUCache:
+    """
+    Thread-safe least-recently-used cache with hit/miss counters.
+
+    Parameters:
+    -----------
+    maxsize : int
+        Maximum number of entries kept before the oldest one is evicted
+    """
+
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """
+        Return the cache counters.
+
+        Returns:
+        --------
+        dict
+            Hits, misses, current size and maximum size
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'size': len(self._data),
+                'maxsize': self.maxsize
+            }
+
+
+def memoized(maxsize=128, quantize=None, name=None):
+    """
+    Decorator caching a function's results in a bounded LRU cache.
+
+    Parameters:
+    -----------
+    maxsize : int
+        Maximum number of cached results
+    quantize : dict, optional
+        Mapping of parameter name to a function that snaps the argument onto
+        its grid. The function is called with the quantized arguments and the
+        cache is keyed on them.
+    name : str, optional
+        Name under which the cache is reported by cache_stats(); defaults to
+        the function name
+
+    Returns:
+    --------
+    callable
+        Decorator. The wrapped function exposes its LRUCache as `.cache`.
+    """
+    quantize = quantize or {}
+
+    def decorator(func):
+        signature = inspect.signature(func)
+        cache = LRUCache(maxsize)
+        _registry[name or func.__name__] = cache
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            for param, snap in quantize.items():
+                bound.arguments[param] = snap(bound.arguments[param])
+            key = tuple(bound.arguments.items())
+
+            missing = object()
+            result = cache.get(key, missing)
+            if result is missing:
+                result = func(*bound.args, **bound.kwargs)
+                cache.put(key, result)
+            return result
+
+        wrapper.cache = cache
+        return wrapper
+
+    return decorator
+
+
+def cache_stats():
+    """
+    Return the hit/miss counters of every registered cache.
+
+    Returns:
+    --------
+    dict
+        Mapping of cache name to its stats() dictionary
+    """
+    return {name: cache.stats() for name, cache in _registry.items()}
+
+
+def clear_caches():
+    """Empty every registered cache and reset its counters."""
+    for cache in _registry.values():
+        cache.clear()
+
+
+_SLIDER_INPUTS = {
+    'bee_percentage': quantize_bee_percentage,
+    'years': quantize_years,
+    'ecosystem_resilience': quantize_resilience
+}
+
+
+@memoized(maxsize=1)
+def cached_initial_data():
+    """Cached get_initial_data()."""
+    from core.data_module import get_initial_data
+    return get_initial_data()
+
+
+@memoized(maxsize=1)
+def cached_scenario_table():
+    """Memory-mapped scenario lookup table, or None when it has not been built."""
+    from core.scenarios import load_scenario_table
+    return load_scenario_table()
+
+
+@memoized(maxsize=1)
+def cached_region_table():
+    """Columnar RegionTable, memory-mapped when it has been built."""
+    from data.regions import load_region_table
+    return load_region_table()
+
+
+@memoized(maxsize=1)
+def cached_region_store():
+    """Indexed RegionStore of the cached region table."""
+    from core.region_store import RegionStore
+    return RegionStore(cached_region_table())
+
+
+@memoized(maxsize=256, quantize=_SLIDER_INPUTS)
+def cached_ecosystem_simulation(bee_percentage, years, ecosystem_resilience):
+    """
+    Cached create_ecosystem_simulation() keyed on the quantized slider inputs,
+    served from the scenario table when it is available.
+    """
+    table = cached_scenario_table()
+    if table is not None:
+        from core.scenarios import lookup_timeseries
+        return lookup_timeseries(table, bee_percentage, years, ecosystem_resilience)
+
+    from core.models import create_ecosystem_simulation
+    return create_ecosystem_simulation(bee_percentage, years, ecosystem_resilience)
+
+
+@memoized(maxsize=1024, quantize={
+    'bee_percentage': quantize_bee_percentage,
+    'ecosystem_resilience': quantize_resilience
+})
+def cached_scenario_metrics(bee_percentage, ecosystem_resilience, region, crop_type):
+    """
+    Metric cards of one slider position, served from the scenario table when
+    it is available.
+    """
+    table = cached_scenario_table()
+    if table is not None:
+        from core.scenarios import lookup_metrics
+        return lookup_metrics(table, bee_percentage, ecosystem_resilience, region, crop_type)
+
+    from core.scenarios import calculate_scenario_metrics
+    values = calculate_scenario_metrics(bee_percentage, ecosystem_resilience, region, crop_type)
+    return {name: float(value) for name, value in values.items()}
+
+
+@memoized(maxsize=32, quantize={'bee_percentage': quantize_bee_percentage})
+def cached_bee_crop_relationship(bee_percentage):
+    """Cached plot_bee_crop_relationship()."""
+    from visualizations import plot_bee_crop_relationship
+    return plot_bee_crop_relationship(bee_percentage)
+
+
+@memoized(maxsize=64, quantize={'bee_percentage': quantize_bee_percentage, 'years': quantize_years})
+def cached_bee_crop_relationship_3d(bee_percentage, years, resolution=(40, 20)):
+    """Cached plot_bee_crop_relationship_3d()."""
+    from visualizations import plot_bee_crop_relationship_3d
+    return plot_bee_crop_relationship_3d(bee_percentage, years, tuple(resolution))
+
+
+@memoized(maxsize=64, quantize={
+    'bee_percentage': quantize_bee_percentage,
+    'ecosystem_resilience': quantize_resilience
+})
+def cached_biodiversity_impact(bee_percentage, ecosystem_resilience):
+    """Cached plot_biodiversity_impact()."""
+    from visualizations import plot_biodiversity_impact
+    return plot_biodiversity_impact(bee_percentage, ecosystem_resilience)
+
+
+@memoized(maxsize=64, quantize={
+    'bee_percentage': quantize_bee_percentage,
+    'ecosystem_resilience': quantize_resilience
+})
+def cached_biodiversity_impact_3d(bee_percentage, ecosystem_resilience, resolution=(30, 30), adaptive=False):
+    """Cached plot_biodiversity_impact_3d()."""
+    from visualizations import plot_biodiversity_impact_3d
+    return plot_biodiversity_impact_3d(bee_percentage, ecosystem_resilience, tuple(resolution), adaptive)
+
+
+@memoized(maxsize=128, quantize=_SLIDER_INPUTS)
+def cached_timeseries_forecast(bee_percentage, years, ecosystem_resilience):
+    """Cached plot_timeseries_forecast() of the cached ecosystem simulation."""
+    from visualizations import plot_timeseries_forecast
+    return plot_timeseries_forecast(
+        cached_ecosystem_simulation(bee_percentage, years, ecosystem_resilience)
+    )
+
+
+@memoized(maxsize=64, quantize=_SLIDER_INPUTS)
+def cached_regional_simulation(bee_percentage, years, ecosystem_resilience, dispersal_rate=0.0):
+    """Cached simulate_regions() over every department."""
+    from core.spatial import simulate_regions
+    return simulate_regions(bee_percentage, years, ecosystem_resilience, dispersal_rate=dispersal_rate)
+
+
+@memoized(maxsize=64, quantize=_SLIDER_INPUTS)
+def cached_economic_cube(bee_percentage, years, ecosystem_resilience):
+    """Economic impact cube of the cached regional simulation."""
+    from core.economics import economic_cube
+    return economic_cube(
+        cached_regional_simulation(bee_percentage, years, ecosystem_resilience),
+        cached_initial_data()['crops']
+    )
+
+
+@memoized(maxsize=32, quantize=_SLIDER_INPUTS)
+def cached_uncertainty_bands(bee_percentage, years, ecosystem_resilience, n_draws=10000):
+    """Percentile bands of a seeded Monte Carlo run of the ecosystem projection."""
+    from core.uncertainty import run_monte_carlo
+    return run_monte_carlo(bee_percentage, years, ecosystem_resilience, n_draws=n_draws, random_state=0)
+
+
+@memoized(maxsize=1, name='cached_risk_base_map')
+def _rendered_risk_base_map():
+    from visualizations import create_risk_base_map
+    base_map = create_risk_base_map()
+    base_map.get_root().render()
+    return base_map
+
+
+def cached_risk_base_map():
+    """
+    Cached create_risk_base_map(), rendered once so st_folium can be called
+    with render=False.
+
+    Returns:
+    --------
+    folium.Map
+        Deep copy of the cached map, with its own root Figure: st_folium
+        renders into the root and attaches the feature_group_to_add layer
+        to the map, so each call must work on a private tree
+    """
+    return copy.deepcopy(_rendered_risk_base_map())
+
+
+@memoized(maxsize=128, quantize={'bee_percentage': quantize_bee_percentage, 'bounds': quantize_bounds})
+def cached_risk_overlay(bee_percentage, bounds=None):
+    """
+    Cached risk_overlay_features() per slider step and viewport, so
+    dragging the slider back to a visited value reuses its features. The
+    viewport is widened with quantize_bounds, so the features also cover a
+    margin around the visible area. Only the GeoJSON data is cached: build
+    a new layer from it with risk_feature_layer on every call.
+    """
+    from visualizations import risk_overlay_features
+    return risk_overlay_features(bee_percentage, bounds)
+
+
+@memoized(maxsize=32, quantize={'bee_percentage': quantize_bee_percentage})
+def cached_risk_map(bee_percentage):
+    """Cached create_risk_map()."""
+    from visualizations import create_risk_map
+    return create_risk_map(bee_percentage)
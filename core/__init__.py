@@ -0,0 +1,11 @@
+"""
+Numeric core of the simulator, importable without Streamlit.
+
+The models, data loaders, scenario tables, figure surfaces, spatial and
+economic engines and the batch runners live here; the Streamlit app
+(main.py, pages/, cache.py, visualizations.py and utils.py) is a thin layer
+on top of them. Importing
+any module of this package only loads numpy: pandas and scipy are imported
+by the functions that build DataFrames or run a numerical solver, so worker
+processes and command line tools start quickly and stay small.
+"""
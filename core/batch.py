@@ -0,0 +1,282 @@
+"""
+Headless batch runner for scenario sweeps.
+
+Reads a scenario file (CSV, JSON array or JSON lines) with one scenario per
+row, simulates every row in parallel worker processes (core.parallel, which
+returns the trajectories through shared memory) and streams the results to
+CSV or Parquet chunk by chunk, without a browser session or the Streamlit
+runtime.
+
+Scenario columns:
+- bee_percentage: bee population percentage (0-100)
+- resilience: ecosystem resilience factor (0-1) or one of the labels of
+  scenarios.RESILIENCE_LEVELS ("Muy baja" ... "Muy alta")
+- years: number of years to simulate
+- region: one of scenarios.REGIONS (default "Todas las regiones")
+- crop_type: one of scenarios.CROP_TYPES (default "Todos")
+
+Usage:
+
+    python -m core.batch scenarios.csv results.parquet [--workers N] [--chunk-size N] [--timeseries]
+"""
+import argparse
+import json
+import os
+from collections import deque
+
+import numpy as np
+
+from core.models import simulate_ensemble
+from core.parallel import simulation_pool, submit_simulations
+from core.scenarios import (
+    METRICS, REGIONS, CROP_TYPES, RESILIENCE_LEVELS, TIMESERIES_VARIABLES,
+    calculate_scenario_metrics
+)
+
+DEFAULT_CHUNK_SIZE = 5000
+
+
+def read_scenarios(path, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Read a scenario file in chunks.
+
+    Parameters:
+    -----------
+    path : str
+        CSV (.csv), JSON array (.json) or JSON lines (.jsonl/.ndjson) file
+    chunk_size : int
+        Number of scenarios per chunk
+
+    Yields:
+    -------
+    pd.DataFrame
+        Normalized scenario chunks
+    """
+    import pandas as pd
+
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.csv':
+        chunks = pd.read_csv(path, chunksize=chunk_size)
+    elif extension in ('.jsonl', '.ndjson'):
+        chunks = pd.read_json(path, lines=True, chunksize=chunk_size)
+    elif extension == '.json':
+        with open(path, encoding='utf-8') as f:
+            records = json.load(f)
+        chunks = (
+            pd.DataFrame(records[start:start + chunk_size])
+            for start in range(0, len(records), chunk_size)
+        )
+    else:
+        raise ValueError(f"Unsupported scenario file type '{extension}', expected .csv, .json or .jsonl")
+
+    for chunk in chunks:
+        yield normalize_scenarios(chunk)
+
+
+def _parse_resilience(value):
+    """Convert a resilience label or number to its numeric factor."""
+    if isinstance(value, str) and value in RESILIENCE_LEVELS:
+        return RESILIENCE_LEVELS[value]
+    try:
+        return float(value)
+    except ValueError:
+        raise ValueError(
+            f"Invalid resilience '{value}', expected a number or one of: {', '.join(RESILIENCE_LEVELS)}"
+        ) from None
+
+
+def normalize_scenarios(scenarios):
+    """
+    Validate a scenario table and fill in the optional columns.
+
+    Parameters:
+    -----------
+    scenarios : pd.DataFrame
+        Scenario rows as read from the input file
+
+    Returns:
+    --------
+    pd.DataFrame
+        Scenarios with numeric resilience and region/crop_type filled in
+    """
+    missing = {'bee_percentage', 'resilience', 'years'} - set(scenarios.columns)
+    if missing:
+        raise ValueError(f"Scenario file is missing columns: {', '.join(sorted(missing))}")
+
+    scenarios = scenarios.copy()
+    scenarios['resilience'] = [_parse_resilience(value) for value in scenarios['resilience']]
+    scenarios['years'] = scenarios['years'].astype(int)
+    if 'region' not in scenarios.columns:
+        scenarios['region'] = REGIONS[0]
+    if 'crop_type' not in scenarios.columns:
+        scenarios['crop_type'] = CROP_TYPES[0]
+
+    unknown_regions = set(scenarios['region']) - set(REGIONS)
+    if unknown_regions:
+        raise ValueError(f"Unknown regions: {', '.join(sorted(unknown_regions))}")
+    unknown_crops = set(scenarios['crop_type']) - set(CROP_TYPES)
+    if unknown_crops:
+        raise ValueError(f"Unknown crop types: {', '.join(sorted(unknown_crops))}")
+
+    return scenarios
+
+
+def run_scenarios(scenarios, timeseries=False, ensemble=None):
+    """
+    Evaluate the models for every scenario row.
+
+    Parameters:
+    -----------
+    scenarios : pd.DataFrame
+        Normalized scenario rows
+    timeseries : bool
+        Return one row per scenario and month instead of one row per scenario
+    ensemble : dict, optional
+        Simulations of the rows, laid out like models.simulate_ensemble
+        (default: simulated here)
+
+    Returns:
+    --------
+    pd.DataFrame
+        Scenario inputs with the metric cards and the final ecosystem state,
+        or the monthly ecosystem trajectories when `timeseries` is set
+    """
+    scenarios = scenarios.reset_index(drop=True)
+    if ensemble is None:
+        ensemble = simulate_ensemble(
+            scenarios['bee_percentage'].values, scenarios['resilience'].values, scenarios['years'].values
+        )
+    states = ensemble['states']
+    n_steps = scenarios['years'].values * 12
+
+    if timeseries:
+        time = np.broadcast_to(ensemble['time'], (len(scenarios), states.shape[-1]))
+        valid = np.arange(states.shape[-1]) < n_steps[:, np.newaxis]
+        rows, steps = np.nonzero(valid)
+        result = scenarios.iloc[rows].reset_index(drop=True)
+        result['time'] = time[rows, steps]
+        for v, name in enumerate(TIMESERIES_VARIABLES):
+            result[name] = states[rows, v, steps]
+        return result
+
+    result = scenarios.copy()
+    for name in METRICS:
+        result[name] = np.nan
+    for (region, crop_type), group in scenarios.groupby(['region', 'crop_type'], sort=False):
+        values = calculate_scenario_metrics(
+            group['bee_percentage'].values, group['resilience'].values, region, crop_type
+        )
+        for name in METRICS:
+            result.loc[group.index, name] = values[name]
+
+    # Ecosystem state at the end of each scenario's horizon
+    final = states[np.arange(len(scenarios)), :, n_steps - 1]
+    for v, name in enumerate(TIMESERIES_VARIABLES):
+        result[f'final_{name}'] = final[:, v]
+
+    return result
+
+
+class _ResultWriter:
+    """Append result chunks to a CSV or Parquet file."""
+
+    def __init__(self, path):
+        self.path = path
+        self.parquet = os.path.splitext(path)[1].lower() in ('.parquet', '.pq')
+        self._writer = None
+        self._header = True
+
+    def write(self, chunk):
+        if self.parquet:
+            # pyarrow is only needed for Parquet output
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if self._writer is None:
+                self._writer = pq.ParquetWriter(self.path, table.schema)
+            self._writer.write_table(table)
+        else:
+            chunk.to_csv(self.path, mode='w' if self._header else 'a', header=self._header, index=False)
+            self._header = False
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+def run_batch(input_path, output_path, workers=None, chunk_size=DEFAULT_CHUNK_SIZE, timeseries=False):
+    """
+    Run every scenario of `input_path` and stream the results to `output_path`.
+
+    Each chunk is split across the worker processes of core.parallel, which
+    write the trajectories into shared memory; the metrics and result tables
+    are built here and written in input order while the workers simulate the
+    next chunk, so memory stays bounded by a few chunks.
+
+    Parameters:
+    -----------
+    input_path : str
+        Scenario file (.csv, .json, .jsonl)
+    output_path : str
+        Result file; Parquet for .parquet/.pq, CSV otherwise
+    workers : int, optional
+        Number of worker processes (default: number of CPUs); 1 runs inline
+    chunk_size : int
+        Number of scenarios per chunk
+    timeseries : bool
+        Write monthly trajectories instead of one summary row per scenario
+
+    Returns:
+    --------
+    int
+        Number of scenarios processed
+    """
+    workers = workers or os.cpu_count() or 1
+    writer = _ResultWriter(output_path)
+    pending = deque()
+    count = 0
+
+    def write_next(pending):
+        nonlocal count
+        scenarios, simulations = pending.popleft()
+        writer.write(run_scenarios(scenarios, timeseries, simulations.result()))
+        count += len(scenarios)
+
+    try:
+        with simulation_pool(workers) as executor:
+            # One chunk is simulated while the previous one is written, and
+            # the input is read lazily
+            for scenarios in read_scenarios(input_path, chunk_size):
+                scenarios = scenarios.reset_index(drop=True)
+                pending.append((scenarios, submit_simulations(
+                    executor, scenarios['bee_percentage'].values, scenarios['resilience'].values,
+                    scenarios['years'].values, chunk_size=-(-len(scenarios) // workers)
+                )))
+                if len(pending) >= 2:
+                    write_next(pending)
+            while pending:
+                write_next(pending)
+    finally:
+        # Chunks left over by an error
+        for _, simulations in pending:
+            simulations.discard()
+        writer.close()
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run bee impact scenario sweeps without Streamlit")
+    parser.add_argument('input', help="Scenario file (.csv, .json or .jsonl)")
+    parser.add_argument('output', help="Result file (.parquet/.pq or .csv)")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: all CPUs)")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help="Scenarios per chunk")
+    parser.add_argument('--timeseries', action='store_true', help="Write monthly trajectories")
+    args = parser.parse_args()
+
+    count = run_batch(args.input, args.output, args.workers, args.chunk_size, args.timeseries)
+    print(f"{count} scenarios written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
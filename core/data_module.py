@@ -1,6 +1,28 @@
-import pandas as pd
 import numpy as np
 
+# Crop types and their dependence on pollinators, as plain columns so the
+# models can use them without pandas
+CROPS_DATA = {
+    'crop': [
+        'Almendras', 'Manzanas', 'Fresas', 'Café', 'Cacao', 
+        'Tomates', 'Calabazas', 'Melones', 'Kiwi', 'Cerezas',
+        'Pepinos', 'Arándanos', 'Aguacates', 'Trigo', 'Maíz',
+        'Arroz', 'Patatas', 'Caña de azúcar'
+    ],
+    'pollinator_dependence': [
+        0.90, 0.85, 0.80, 0.75, 0.70,
+        0.65, 0.95, 0.85, 0.90, 0.80,
+        0.65, 0.90, 0.40, 0.05, 0.10,
+        0.00, 0.10, 0.00
+    ],
+    'global_production_value': [
+        8.5, 9.2, 7.5, 9.8, 8.9,
+        10.0, 4.2, 5.8, 3.2, 6.7,
+        5.1, 4.8, 7.2, 9.5, 9.8,
+        10.0, 8.7, 9.2
+    ]
+}
+
 def get_initial_data():
     """
     Generate initial data for the application.
@@ -13,27 +35,10 @@ def get_initial_data():
     dict
         Dictionary containing various dataframes and values
     """
+    import pandas as pd
+    
     # Define crop types and their dependence on pollinators
-    crops_data = pd.DataFrame({
-        'crop': [
-            'Almendras', 'Manzanas', 'Fresas', 'Café', 'Cacao', 
-            'Tomates', 'Calabazas', 'Melones', 'Kiwi', 'Cerezas',
-            'Pepinos', 'Arándanos', 'Aguacates', 'Trigo', 'Maíz',
-            'Arroz', 'Patatas', 'Caña de azúcar'
-        ],
-        'pollinator_dependence': [
-            0.90, 0.85, 0.80, 0.75, 0.70,
-            0.65, 0.95, 0.85, 0.90, 0.80,
-            0.65, 0.90, 0.40, 0.05, 0.10,
-            0.00, 0.10, 0.00
-        ],
-        'global_production_value': [
-            8.5, 9.2, 7.5, 9.8, 8.9,
-            10.0, 4.2, 5.8, 3.2, 6.7,
-            5.1, 4.8, 7.2, 9.5, 9.8,
-            10.0, 8.7, 9.2
-        ]
-    })
+    crops_data = pd.DataFrame(CROPS_DATA)
     
     # Historical bee population data (percentage of optimal)
     years = np.arange(1990, 2023)
@@ -83,6 +88,17 @@ def get_initial_data():
             2.6, 2.5, 2.0, 2.7, 3.1,
             2.4, 2.2, 2.1, 2.9, 2.7
         ],
+        # Coordinates of the department capitals, for the dispersal between departments
+        'lat': [
+            6.2442, 3.4516, 4.7110, 7.1193, 5.5353,
+            2.9273, 4.4389, 1.2136, 2.4448, 5.0703,
+            11.2408, 10.4631, 4.1420, 4.8133, 4.5339
+        ],
+        'lon': [
+            -75.5812, -76.5320, -74.0721, -73.1227, -73.3678,
+            -75.2819, -75.2322, -77.2811, -76.6147, -75.5138,
+            -74.1990, -73.2532, -73.6266, -75.6961, -75.6811
+        ],
         'main_crops': [
             'Café, Aguacate, Flores', 'Caña, Frutas, Café', 'Flores, Fresas, Hortalizas', 
             'Cacao, Cítricos, Plátano', 'Frutas, Papa, Cereales',
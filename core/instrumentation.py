@@ -0,0 +1,319 @@
+"""
+Opt-in timing and allocation instrumentation of the simulator hot paths.
+
+The model and figure entry points are wrapped with `instrumented`, and
+other code blocks (e.g. the st_folium transfer in main.py) with the `timed`
+context manager. Both are pass-throughs until `enable()` is called or the
+ABEJAS_INSTRUMENTATION environment variable is set ("1" for wall time and
+call counts, "alloc" to also trace allocations with tracemalloc).
+
+`enable()` and `disable()` only affect the calling thread, which in
+Streamlit is the script thread of one session: a debug rerun does not make
+other sessions record anything. tracemalloc itself is process-wide, so it
+runs only while at least one thread has allocation tracing enabled and is
+stopped when the last one disables it or ends. The environment variable
+enables every thread, for headless runs.
+
+Records are kept per thread as well: the page calls `reset()` at the top
+of the script and reads `snapshot()` at the bottom. For every instrumented
+name they hold the number of calls, the total and maximum wall time, the
+bytes allocated and still held when the call returned, and the peak traced
+memory above the starting point of the outermost call. `to_json_lines` and `to_prometheus` format a snapshot for
+log shipping and for the Prometheus text exposition format.
+
+Cache hits in cache.py return before reaching the wrapped functions, so a
+rerun only reports the work it actually did.
+"""
+import contextlib
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+import weakref
+
+ENV_VARIABLE = 'ABEJAS_INSTRUMENTATION'
+METRIC_PREFIX = 'abejas'
+
+RECORD_FIELDS = ['calls', 'seconds', 'max_seconds', 'allocated_bytes', 'peak_bytes']
+
+# Prometheus metric name suffix, record field, metric type and help text. The
+# records start over at every reset() (every rerun of the page), so they are
+# exported as gauges of the rerun rather than as counters, which Prometheus
+# would read as restarting on every rerun
+PROMETHEUS_METRICS = [
+    ('rerun_calls', 'calls', 'gauge', "Number of calls of the instrumented function in the rerun"),
+    ('rerun_seconds', 'seconds', 'gauge', "Total wall time spent in the instrumented function in the rerun"),
+    ('rerun_seconds_max', 'max_seconds', 'gauge', "Longest single call of the instrumented function in the rerun"),
+    ('rerun_allocated_bytes', 'allocated_bytes', 'gauge',
+     "Bytes allocated by the instrumented function in the rerun and still held when it returned"),
+    ('rerun_peak_bytes', 'peak_bytes', 'gauge', "Peak traced memory above the start of the outermost call")
+]
+
+_local = threading.local()
+
+# Threads with allocation tracing enabled, and whether this module started tracemalloc
+_tracemalloc_lock = threading.Lock()
+_tracemalloc_state = {'users': 0, 'started': False}
+
+
+class _Settings:
+    """Instrumentation settings of one thread."""
+
+    def __init__(self, allocations):
+        self.allocations = allocations
+        self.release = None
+
+
+def _acquire_tracemalloc():
+    with _tracemalloc_lock:
+        if _tracemalloc_state['users'] == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _tracemalloc_state['started'] = True
+        _tracemalloc_state['users'] += 1
+
+
+def _release_tracemalloc():
+    with _tracemalloc_lock:
+        _tracemalloc_state['users'] -= 1
+        if _tracemalloc_state['users'] == 0 and _tracemalloc_state['started']:
+            tracemalloc.stop()
+            _tracemalloc_state['started'] = False
+
+
+def _new_settings(allocations):
+    settings = _Settings(allocations)
+    if allocations:
+        _acquire_tracemalloc()
+        # Runs on disable() or, at the latest, when the thread's settings are
+        # garbage collected because the thread ended
+        settings.release = weakref.finalize(settings, _release_tracemalloc)
+    return settings
+
+
+# Settings of the threads that never called enable() or disable()
+_ENV_SETTINGS = (
+    _new_settings(os.environ[ENV_VARIABLE] == 'alloc')
+    if os.environ.get(ENV_VARIABLE, '') not in ('', '0') else None
+)
+
+
+def enable(allocations=False):
+    """
+    Start recording instrumented calls in the current thread.
+
+    Parameters:
+    -----------
+    allocations : bool
+        Also trace memory allocations with tracemalloc, which slows down
+        allocation-heavy code in every thread while it is enabled
+    """
+    disable()
+    _local.settings = _new_settings(allocations)
+
+
+def disable():
+    """Stop recording in the current thread and release its use of tracemalloc."""
+    settings = getattr(_local, 'settings', None)
+    _local.settings = None
+    if settings is not None and settings.release is not None:
+        settings.release()
+
+
+def is_enabled():
+    """Whether instrumented calls are being recorded in the current thread."""
+    return getattr(_local, 'settings', _ENV_SETTINGS) is not None
+
+
+def _records():
+    records = getattr(_local, 'records', None)
+    if records is None:
+        records = _local.records = {}
+    return records
+
+
+def reset():
+    """Discard the records of the current thread (e.g. at the start of a rerun)."""
+    _local.records = {}
+
+
+def _record(name, seconds, allocated, peak):
+    record = _records().get(name)
+    if record is None:
+        record = _records()[name] = dict.fromkeys(RECORD_FIELDS, 0)
+    record['calls'] += 1
+    record['seconds'] += seconds
+    record['max_seconds'] = max(record['max_seconds'], seconds)
+    record['allocated_bytes'] += allocated
+    record['peak_bytes'] = max(record['peak_bytes'], peak)
+
+
+@contextlib.contextmanager
+def timed(name):
+    """
+    Context manager recording the wall time and allocations of a block.
+
+    Parameters:
+    -----------
+    name : str
+        Name under which the block is reported
+    """
+    settings = getattr(_local, 'settings', _ENV_SETTINGS)
+    if settings is None:
+        yield
+        return
+
+    depth = getattr(_local, 'depth', 0)
+    tracing = settings.allocations and tracemalloc.is_tracing()
+    if tracing:
+        # The peak can only be reset by the outermost block without
+        # hiding the peak of the blocks enclosing it
+        if depth == 0:
+            tracemalloc.reset_peak()
+        start_memory = tracemalloc.get_traced_memory()[0]
+    _local.depth = depth + 1
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        _local.depth = depth
+        allocated = peak = 0
+        if tracing:
+            current, peak_memory = tracemalloc.get_traced_memory()
+            allocated = max(current - start_memory, 0)
+            if depth == 0:
+                peak = max(peak_memory - start_memory, 0)
+        _record(name, elapsed, allocated, peak)
+
+
+def instrumented(name=None):
+    """
+    Decorator recording every call of a function with `timed`.
+
+    Parameters:
+    -----------
+    name : str, optional
+        Name under which the calls are reported; defaults to the module and
+        qualified name of the function
+
+    Returns:
+    --------
+    callable
+        Decorator. While instrumentation is disabled the wrapper only adds
+        a flag check to each call.
+    """
+    def decorator(func):
+        label = name or f"{func.__module__}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if getattr(_local, 'settings', _ENV_SETTINGS) is None:
+                return func(*args, **kwargs)
+            with timed(label):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def snapshot():
+    """
+    Records of the current thread, slowest first.
+
+    Returns:
+    --------
+    list of dict
+        One dictionary per instrumented name with 'name' and RECORD_FIELDS
+    """
+    records = [{'name': name, **record} for name, record in _records().items()]
+    return sorted(records, key=lambda record: record['seconds'], reverse=True)
+
+
+def to_json_lines(records, **labels):
+    """
+    Format records as JSON lines.
+
+    Parameters:
+    -----------
+    records : list of dict
+        Result of snapshot
+    **labels
+        Extra fields added to every line (e.g. session or page)
+
+    Returns:
+    --------
+    str
+        One JSON object per record, each with a 'timestamp' in seconds
+    """
+    timestamp = time.time()
+    return ''.join(
+        json.dumps({'timestamp': timestamp, **labels, **record}, ensure_ascii=False) + '\n'
+        for record in records
+    )
+
+
+def _label_value(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def to_prometheus(records, **labels):
+    """
+    Format records in the Prometheus text exposition format.
+
+    Parameters:
+    -----------
+    records : list of dict
+        Result of snapshot
+    **labels
+        Extra labels added to every sample
+
+    Returns:
+    --------
+    str
+        HELP, TYPE and one gauge sample per record for each of
+        PROMETHEUS_METRICS, describing the records since the last reset()
+    """
+    lines = []
+    for suffix, field, kind, description in PROMETHEUS_METRICS:
+        metric = f"{METRIC_PREFIX}_{suffix}"
+        lines.append(f"# HELP {metric} {description}")
+        lines.append(f"# TYPE {metric} {kind}")
+        for record in records:
+            sample_labels = ','.join(
+                f'{key}="{_label_value(value)}"' for key, value in {**labels, 'function': record['name']}.items()
+            )
+            lines.append(f"{metric}{{{sample_labels}}} {record[field]}")
+    return '\n'.join(lines) + '\n'
+
+
+def export(path, records=None, **labels):
+    """
+    Write records to a file: Prometheus text for .prom paths, otherwise
+    appended JSON lines.
+
+    Parameters:
+    -----------
+    path : str
+        Output file
+    records : list of dict, optional
+        Records to write (default: snapshot())
+    **labels
+        Extra fields or labels, see to_json_lines and to_prometheus
+
+    Returns:
+    --------
+    str
+        The output path
+    """
+    records = snapshot() if records is None else records
+    if os.path.splitext(path)[1].lower() == '.prom':
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(to_prometheus(records, **labels))
+    else:
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(to_json_lines(records, **labels))
+    return path
+
@@ -0,0 +1,221 @@
+"""
+Process-pool executor for large batches of ecosystem simulations.
+
+`create_ecosystem_simulation` runs on a single core, and its numeric path
+holds the GIL inside the odeint callback, so threads do not help. This
+module splits a batch of scenarios into chunks, runs each chunk in a worker
+process and has the workers write their trajectories straight into a
+shared-memory output buffer, so no DataFrames are pickled back to the
+parent process. core.batch submits its scenario chunks through it.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from core.models import _ensemble_time_grid, simulate_ecosystem_states, simulate_ensemble
+
+VARIABLES = ['biodiversity', 'crop_production', 'wild_plants', 'bee_population']
+DEFAULT_CHUNK_SIZE = 64
+
+
+def _simulate_chunk(buffer_name, shape, start, bee_chunk, resilience_chunk, years_chunk, solver,
+                    trajectory_chunk):
+    """
+    Simulate a chunk of scenarios and write them into the shared output buffer.
+
+    Runs in a worker process. Rows `start` to `start + len(bee_chunk)` of the
+    (n_scenarios, 4, n_steps) buffer are filled in, NaN beyond each
+    scenario's horizon. `years_chunk` is an int when shared by the batch, so
+    the time grid matches models.simulate_ensemble.
+    """
+    buffer = shared_memory.SharedMemory(name=buffer_name)
+    try:
+        states = np.ndarray(shape, dtype=np.float64, buffer=buffer.buf)
+        rows = slice(start, start + len(bee_chunk))
+        if trajectory_chunk is None and solver in ('auto', 'analytic'):
+            # Constant populations: closed form for the whole chunk at once
+            chunk_states = simulate_ensemble(bee_chunk, resilience_chunk, years_chunk)['states']
+            states[rows, :, :chunk_states.shape[-1]] = chunk_states
+            states[rows, :, chunk_states.shape[-1]:] = np.nan
+        else:
+            for offset, (bee_percentage, resilience, years) in enumerate(
+                    zip(bee_chunk, resilience_chunk, np.broadcast_to(years_chunk, len(bee_chunk)))):
+                n_steps = int(years) * 12
+                trajectory = None if trajectory_chunk is None else trajectory_chunk[offset, :n_steps]
+                states[start + offset, :, :n_steps] = simulate_ecosystem_states(
+                    bee_percentage, int(years), resilience, bee_trajectory=trajectory, solver=solver
+                )['states']
+                states[start + offset, :, n_steps:] = np.nan
+        del states
+    finally:
+        buffer.close()
+
+
+def simulation_pool(workers=None):
+    """
+    Worker pool shared by several submit_simulations calls.
+
+    Parameters:
+    -----------
+    workers : int, optional
+        Number of worker processes (default: number of CPUs); 1 runs inline
+
+    Returns:
+    --------
+    context manager
+        A ProcessPoolExecutor, or None when `workers` is 1
+    """
+    if workers == 1:
+        return nullcontext()
+    return ProcessPoolExecutor(max_workers=workers or os.cpu_count())
+
+
+class PendingSimulations:
+    """Simulations running in worker processes; result() waits and collects them."""
+
+    def __init__(self, buffer, shape, futures, inputs, time):
+        self._buffer = buffer
+        self._shape = shape
+        self._futures = futures
+        self._inputs = inputs
+        self._time = time
+
+    def result(self):
+        """
+        Wait for every chunk and return the simulations.
+
+        Returns:
+        --------
+        dict
+            Dictionary with 'variables', 'bee_percentage', 'resilience',
+            'years', 'time' and 'states' of shape (n_scenarios, 4, n_steps),
+            laid out like the result of models.simulate_ensemble
+        """
+        try:
+            for future in self._futures:
+                # Re-raise worker errors in the parent
+                future.result()
+            states = np.ndarray(self._shape, dtype=np.float64, buffer=self._buffer.buf).copy()
+        finally:
+            self._buffer.close()
+            self._buffer.unlink()
+
+        bee_array, resilience_array, years_array = self._inputs
+        return {
+            'variables': VARIABLES,
+            'bee_percentage': bee_array,
+            'resilience': resilience_array,
+            'years': years_array,
+            'time': self._time,
+            'states': states
+        }
+
+    def discard(self):
+        """Free the output buffer without collecting the simulations."""
+        for future in self._futures:
+            future.cancel()
+        self._buffer.close()
+        self._buffer.unlink()
+
+
+def submit_simulations(executor, bee_array, resilience_array, years, bee_trajectories=None,
+                       solver='auto', chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Start simulating a batch of scenarios without waiting for the results.
+
+    Parameters:
+    -----------
+    executor : ProcessPoolExecutor or None
+        Pool from simulation_pool; None simulates inline before returning
+    bee_array, resilience_array, years, bee_trajectories, solver, chunk_size
+        See run_parallel_simulations
+
+    Returns:
+    --------
+    PendingSimulations
+        Handle whose result() returns the simulations
+    """
+    bee_array, resilience_array, years_array = np.broadcast_arrays(
+        np.atleast_1d(np.asarray(bee_array, dtype=float)),
+        np.atleast_1d(np.asarray(resilience_array, dtype=float)),
+        np.atleast_1d(np.asarray(years, dtype=int))
+    )
+    bee_array = bee_array.ravel()
+    resilience_array = resilience_array.ravel()
+    years_array = years_array.ravel()
+    if np.any(years_array < 1):
+        raise ValueError("years must be at least 1")
+
+    n_scenarios = len(bee_array)
+    n_steps = int(years_array.max()) * 12
+    if bee_trajectories is not None:
+        bee_trajectories = np.asarray(bee_trajectories, dtype=float).reshape(n_scenarios, n_steps)
+
+    shape = (n_scenarios, len(VARIABLES), n_steps)
+    buffer = shared_memory.SharedMemory(create=True, size=max(1, int(np.prod(shape)) * 8))
+    try:
+        chunks = [
+            (buffer.name, shape, start,
+             bee_array[start:start + chunk_size],
+             resilience_array[start:start + chunk_size],
+             int(years) if np.ndim(years) == 0 else years_array[start:start + chunk_size], solver,
+             None if bee_trajectories is None else bee_trajectories[start:start + chunk_size])
+            for start in range(0, n_scenarios, chunk_size)
+        ]
+
+        if executor is None:
+            for chunk in chunks:
+                _simulate_chunk(*chunk)
+            futures = []
+        else:
+            futures = [executor.submit(_simulate_chunk, *chunk) for chunk in chunks]
+    except BaseException:
+        buffer.close()
+        buffer.unlink()
+        raise
+
+    time, _ = _ensemble_time_grid(years, years_array)
+    return PendingSimulations(buffer, shape, futures, (bee_array, resilience_array, years_array), time)
+
+
+def run_parallel_simulations(bee_array, resilience_array, years, bee_trajectories=None,
+                             solver='auto', workers=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Run create_ecosystem_simulation for many scenarios across worker processes.
+
+    Parameters:
+    -----------
+    bee_array : array-like
+        Bee population percentage (0-100) of each scenario
+    resilience_array : array-like
+        Ecosystem resilience factor (0-1) of each scenario, broadcast against
+        `bee_array`
+    years : int or array-like
+        Number of years to simulate, either shared by all scenarios or one
+        value per scenario. Scenarios shorter than the longest one are padded
+        with NaN after their last time point.
+    bee_trajectories : array-like, optional
+        Bee population percentage at each monthly time point, shape
+        (n_scenarios, max(years) * 12); see create_ecosystem_simulation
+    solver : str
+        Solver passed to create_ecosystem_simulation; constant populations
+        with 'auto' or 'analytic' are evaluated a chunk at a time
+    workers : int, optional
+        Number of worker processes (default: number of CPUs); 1 runs inline
+    chunk_size : int
+        Number of scenarios handed to a worker at a time
+
+    Returns:
+    --------
+    dict
+        Dictionary with 'variables', 'bee_percentage', 'resilience', 'years',
+        'time' and 'states' of shape (n_scenarios, 4, max(years) * 12), laid
+        out like the result of models.simulate_ensemble
+    """
+    with simulation_pool(workers) as executor:
+        return submit_simulations(
+            executor, bee_array, resilience_array, years, bee_trajectories, solver, chunk_size
+        ).result()
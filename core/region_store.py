@@ -0,0 +1,239 @@
+"""
+Indexed store of map regions for fast filtering.
+
+The map pages filter the region list by risk level, by a minimum pollinator
+dependency and, when zoomed in, by the visible bounding box. Scanning every
+record on each rerun is fine for the 15 regions of `data.regions` but not
+for municipality- or farm-level points, so the store builds three indexes
+once:
+
+- a uniform lat/lon grid whose cells are stored contiguously, so a bounding
+  box only touches the rows in the cells it overlaps
+- the rows sorted by dependency, so a threshold is a binary search
+- the rows of each risk level, so a risk selection is a dictionary lookup
+
+The store indexes a columnar data.regions.RegionTable; queries return
+sorted row indices, and only the matching rows are turned into records.
+"""
+import numpy as np
+
+DEFAULT_CELL_SIZE = 0.5  # Grid cell size in degrees (about 55 km)
+
+
+class RegionStore:
+    """
+    Region table with spatial, risk and dependency indexes.
+
+    Parameters:
+    -----------
+    table : data.regions.RegionTable
+        Columnar region table with 'lat', 'lon', 'risk' and 'dependency' columns
+    cell_size : float
+        Size of the spatial grid cells in degrees
+    """
+
+    def __init__(self, table, cell_size=DEFAULT_CELL_SIZE):
+        self.table = table
+        self.cell_size = cell_size
+        self.lat = table.columns['lat']
+        self.lon = table.columns['lon']
+        self.dependency = table.columns['dependency']
+        self.risk = table.columns['risk']  # Category codes
+        self._build_indexes()
+
+    def __len__(self):
+        return len(self.table)
+
+    def _build_indexes(self):
+        # Dependency index: row order by ascending dependency
+        self._dependency_order = np.argsort(self.dependency, kind='stable')
+        self._dependency_sorted = self.dependency[self._dependency_order]
+
+        # Risk index: sorted rows of each risk category code
+        self._risk_rows = {code: np.flatnonzero(self.risk == code) for code in np.unique(self.risk)}
+
+        # Spatial index: rows ordered by grid cell (column-major: lon, then lat)
+        if len(self):
+            self._origin = (float(self.lat.min()), float(self.lon.min()))
+            self._n_lat_cells = int((self.lat.max() - self._origin[0]) // self.cell_size) + 1
+        else:
+            self._origin = (0.0, 0.0)
+            self._n_lat_cells = 1
+        cells = self._cell_ids(self.lat, self.lon)
+        self._cell_order = np.argsort(cells, kind='stable')
+        self._cells_sorted = cells[self._cell_order]
+
+    def _cell_coordinates(self, lat, lon):
+        # float64 arithmetic so stored float32 coordinates and query bounds agree
+        lat_cell = np.floor((np.asarray(lat, dtype=float) - self._origin[0]) / self.cell_size).astype(np.int64)
+        lon_cell = np.floor((np.asarray(lon, dtype=float) - self._origin[1]) / self.cell_size).astype(np.int64)
+        return lat_cell, lon_cell
+
+    def _cell_ids(self, lat, lon):
+        lat_cell, lon_cell = self._cell_coordinates(lat, lon)
+        return lon_cell * self._n_lat_cells + lat_cell
+
+    def by_risk(self, levels):
+        """
+        Rows whose risk level is one of `levels`.
+
+        Parameters:
+        -----------
+        levels : iterable of str
+            Risk levels to keep (e.g. ["Alto", "Medio"])
+
+        Returns:
+        --------
+        np.ndarray
+            Sorted row indices
+        """
+        rows = [self._risk_rows[code] for code in self.table.codes('risk', levels) if code in self._risk_rows]
+        if not rows:
+            return np.empty(0, dtype=np.int64)
+        return np.sort(np.concatenate(rows))
+
+    def by_dependency(self, minimum=None, maximum=None):
+        """
+        Rows whose dependency lies within [minimum, maximum].
+
+        Parameters:
+        -----------
+        minimum, maximum : float, optional
+            Inclusive bounds on the pollinator dependency (%)
+
+        Returns:
+        --------
+        np.ndarray
+            Sorted row indices
+        """
+        start = 0 if minimum is None else np.searchsorted(self._dependency_sorted, minimum, side='left')
+        stop = len(self) if maximum is None else np.searchsorted(self._dependency_sorted, maximum, side='right')
+        return np.sort(self._dependency_order[start:stop])
+
+    def in_bounds(self, south, west, north, east):
+        """
+        Rows located inside a bounding box.
+
+        Only the grid cells overlapping the box are visited; for each grid
+        column the overlapping cells form one contiguous run of the cell
+        index, found by binary search.
+
+        Parameters:
+        -----------
+        south, west, north, east : float
+            Bounding box in degrees
+
+        Returns:
+        --------
+        np.ndarray
+            Sorted row indices
+        """
+        if len(self) == 0 or south > north or west > east:
+            return np.empty(0, dtype=np.int64)
+
+        lat_low, lon_low = self._cell_coordinates(south, west)
+        lat_high, lon_high = self._cell_coordinates(north, east)
+        lat_low = max(int(lat_low), 0)
+        lat_high = min(int(lat_high), self._n_lat_cells - 1)
+        if lat_low > lat_high:
+            return np.empty(0, dtype=np.int64)
+
+        lon_columns = np.arange(max(int(lon_low), 0), int(lon_high) + 1)
+        first = np.searchsorted(self._cells_sorted, lon_columns * self._n_lat_cells + lat_low, side='left')
+        last = np.searchsorted(self._cells_sorted, lon_columns * self._n_lat_cells + lat_high, side='right')
+        candidates = np.concatenate(
+            [self._cell_order[a:b] for a, b in zip(first, last) if b > a] or [np.empty(0, dtype=np.int64)]
+        )
+
+        # Cells on the edge of the box can hold rows just outside it
+        lat = self.lat[candidates].astype(float)
+        lon = self.lon[candidates].astype(float)
+        inside = (lat >= south) & (lat <= north) & (lon >= west) & (lon <= east)
+        return np.sort(candidates[inside])
+
+    def nearest(self, lat, lon, max_distance=0.05):
+        """
+        Row closest to a point, searched within a small box around it.
+
+        Used to resolve map clicks to a region when popups are loaded lazily.
+
+        Parameters:
+        -----------
+        lat, lon : float
+            Point in degrees
+        max_distance : float
+            Half-size of the search box in degrees
+
+        Returns:
+        --------
+        int or None
+            Row index, or None when no row lies within the box
+        """
+        rows = self.in_bounds(lat - max_distance, lon - max_distance, lat + max_distance, lon + max_distance)
+        if len(rows) == 0:
+            return None
+        distance = (self.lat[rows].astype(float) - lat) ** 2 + (self.lon[rows].astype(float) - lon) ** 2
+        return int(rows[np.argmin(distance)])
+
+    def query(self, risk=None, min_dependency=None, bounds=None):
+        """
+        Rows matching every given filter.
+
+        Parameters:
+        -----------
+        risk : iterable of str, optional
+            Risk levels to keep
+        min_dependency : float, optional
+            Minimum pollinator dependency (%)
+        bounds : tuple of float, optional
+            (south, west, north, east) bounding box in degrees
+
+        Returns:
+        --------
+        np.ndarray
+            Sorted row indices
+        """
+        # Start from the most selective index available and test the
+        # remaining filters on those candidates only
+        if bounds is not None:
+            rows = self.in_bounds(*bounds)
+        elif min_dependency is not None:
+            rows = self.by_dependency(minimum=min_dependency)
+            min_dependency = None
+        elif risk is not None:
+            return self.by_risk(risk)
+        else:
+            return np.arange(len(self))
+
+        if min_dependency is not None:
+            rows = rows[self.dependency[rows] >= min_dependency]
+        if risk is not None:
+            rows = rows[np.isin(self.risk[rows], self.table.codes('risk', risk))]
+        return rows
+
+    def select(self, rows):
+        """
+        Resolve row indices to their region records.
+
+        Parameters:
+        -----------
+        rows : array-like of int
+            Row indices, as returned by query
+
+        Returns:
+        --------
+        list of dict
+            The region records
+        """
+        return self.table.records(rows)
+
+    def filter(self, risk=None, min_dependency=None, bounds=None):
+        """
+        Records matching every given filter; see query.
+
+        Returns:
+        --------
+        list of dict
+            The matching region records in store order
+        """
+        return self.select(self.query(risk, min_dependency, bounds))
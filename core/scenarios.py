@@ -0,0 +1,306 @@
+"""
+Precomputed scenario lookup table covering the whole slider space of main.py.
+
+The controls in main.py only take discrete values (19 bee percentages, 5
+resilience levels, 50 simulation horizons, 10 regions and 5 crop types), so
+every metric card and every time series the app can show is enumerable.
+`build_scenario_table` precomputes all of them offline into a directory of
+`.npy` files and `load_scenario_table` maps them back read-only with
+`np.load(..., mmap_mode='r')`, so serving a slider position is an index
+lookup and cold-start memory stays small.
+
+Build the table with:
+
+    python -m core.scenarios build [--output DIR]
+"""
+import argparse
+import json
+import os
+
+import numpy as np
+
+from core.data_module import CROPS_DATA
+from core.models import (
+    calculate_biodiversity_impact, calculate_crop_production, calculate_crop_production_by_crop,
+    simulate_ensemble
+)
+
+DEFAULT_TABLE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'scenario_table'
+)
+
+# Slider and selector values offered by main.py
+BEE_PERCENTAGES = np.arange(10, 101, 5)
+RESILIENCE_LEVELS = {
+    "Muy baja": 0.2,
+    "Baja": 0.4,
+    "Media": 0.6,
+    "Alta": 0.8,
+    "Muy alta": 1.0
+}
+YEARS = np.arange(1, 51)
+REGIONS = [
+    "Todas las regiones", "Zona Cafetera", "Valle del Cauca", "Antioquia", "Santander",
+    "Boyacá", "Cundinamarca", "Huila", "Cauca", "Amazonia"
+]
+CROP_TYPES = ["Todos", "Café", "Frutales", "Hortalizas", "Cereales"]
+
+# Crops of the crops table aggregated by each crop type ("Todos" uses every crop)
+CROPS = {name: np.asarray(values) for name, values in CROPS_DATA.items()}
+CROP_TYPE_CROPS = {
+    "Todos": list(CROPS['crop']),
+    "Café": ["Café"],
+    "Frutales": ["Almendras", "Manzanas", "Fresas", "Cacao", "Melones", "Kiwi", "Cerezas", "Arándanos", "Aguacates"],
+    "Hortalizas": ["Tomates", "Calabazas", "Pepinos", "Patatas"],
+    "Cereales": ["Trigo", "Maíz", "Arroz"]
+}
+
+# Per-region display name, biodiversity modifier and impact bases
+REGION_PARAMETERS = {
+    region: {
+        'display_name': "Colombia",
+        'biodiversity_modifier': 1.0,
+        'base_species': 3000,
+        'economic_base': 450,  # Millones de dólares
+        'jobs_base': 100000
+    }
+    for region in REGIONS
+}
+REGION_PARAMETERS["Todas las regiones"].update(base_species=20000, economic_base=2800, jobs_base=800000)
+REGION_PARAMETERS["Zona Cafetera"].update(
+    display_name="Eje Cafetero", biodiversity_modifier=1.15, economic_base=950, jobs_base=250000
+)
+REGION_PARAMETERS["Valle del Cauca"].update(
+    display_name="Valle del Cauca", biodiversity_modifier=1.1, economic_base=850, jobs_base=200000
+)
+REGION_PARAMETERS["Antioquia"].update(
+    display_name="Antioquia", biodiversity_modifier=1.2, base_species=5000,
+    economic_base=950, jobs_base=250000
+)
+REGION_PARAMETERS["Cauca"].update(base_species=5000)
+REGION_PARAMETERS["Amazonia"].update(display_name="Amazonia", biodiversity_modifier=1.3, base_species=8000)
+
+METRICS = [
+    'crop_production',
+    'biodiversity',
+    'adjusted_crop_production',
+    'adjusted_biodiversity',
+    'species_at_risk',
+    'economic_loss',
+    'jobs_affected'
+]
+
+TIMESERIES_VARIABLES = ['biodiversity', 'crop_production', 'wild_plants', 'bee_population']
+
+
+def calculate_scenario_metrics(bee_percentage, ecosystem_resilience, region, crop_type):
+    """
+    Calculate the metric cards shown in main.py for one region and crop type.
+
+    Parameters:
+    -----------
+    bee_percentage : float or array-like
+        Percentage of bee population (0-100)
+    ecosystem_resilience : float or array-like
+        Ecosystem resilience factor (0-1), broadcast against `bee_percentage`
+    region : str
+        One of REGIONS
+    crop_type : str
+        One of CROP_TYPES
+
+    Returns:
+    --------
+    dict
+        Mapping of each name in METRICS to its value(s)
+    """
+    params = REGION_PARAMETERS[region]
+    bee_percentage = np.asarray(bee_percentage, dtype=float)
+
+    crop_production = calculate_crop_production(bee_percentage)
+    selected = np.isin(CROPS['crop'], CROP_TYPE_CROPS[crop_type])
+    crop_type_production = calculate_crop_production_by_crop(
+        bee_percentage, CROPS['pollinator_dependence'][selected], CROPS['global_production_value'][selected],
+        per_crop=False
+    )['aggregate']
+    biodiversity = calculate_biodiversity_impact(bee_percentage, ecosystem_resilience)
+    bee_loss = np.maximum(0, 100 - bee_percentage)
+
+    return {
+        'crop_production': crop_production,
+        'biodiversity': biodiversity,
+        'adjusted_crop_production': crop_type_production,
+        'adjusted_biodiversity': np.minimum(100, biodiversity * params['biodiversity_modifier']),
+        'species_at_risk': np.trunc(bee_loss * 0.2 * params['base_species'] / 100),
+        'economic_loss': params['economic_base'] * (bee_loss / 100),
+        'jobs_affected': np.trunc(params['jobs_base'] * (bee_loss / 100) * 0.7)
+    }
+
+
+def build_scenario_table(output_dir=DEFAULT_TABLE_DIR):
+    """
+    Precompute every slider combination and write it to `output_dir`.
+
+    Writes:
+    - metrics.npy: float64, shape (len(METRICS), bee, resilience, region, crop_type)
+    - timeseries.npy: float32, shape (bee, resilience, years, 4, 600), NaN-padded
+      after the last month of each horizon
+    - index.json: the axis values of both arrays
+
+    Parameters:
+    -----------
+    output_dir : str
+        Directory to write the table into
+
+    Returns:
+    --------
+    str
+        The output directory
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    resilience_values = np.array(list(RESILIENCE_LEVELS.values()))
+    bee_grid, resilience_grid = np.meshgrid(BEE_PERCENTAGES, resilience_values, indexing='ij')
+
+    metrics = np.empty((len(METRICS), len(BEE_PERCENTAGES), len(resilience_values),
+                        len(REGIONS), len(CROP_TYPES)))
+    for r, region in enumerate(REGIONS):
+        for c, crop_type in enumerate(CROP_TYPES):
+            values = calculate_scenario_metrics(bee_grid, resilience_grid, region, crop_type)
+            for m, name in enumerate(METRICS):
+                metrics[m, :, :, r, c] = values[name]
+    np.save(os.path.join(output_dir, 'metrics.npy'), metrics)
+
+    # One scenario per (bee, resilience, years) combination
+    bee_s, res_s, years_s = np.meshgrid(BEE_PERCENTAGES, resilience_values, YEARS, indexing='ij')
+    ensemble = simulate_ensemble(bee_s.ravel(), res_s.ravel(), years_s.ravel(), dtype=np.float32)
+    timeseries = ensemble['states'].reshape(bee_s.shape + ensemble['states'].shape[1:])
+    np.save(os.path.join(output_dir, 'timeseries.npy'), timeseries)
+
+    with open(os.path.join(output_dir, 'index.json'), 'w', encoding='utf-8') as f:
+        json.dump({
+            'bee_percentage': BEE_PERCENTAGES.tolist(),
+            'resilience': resilience_values.tolist(),
+            'years': YEARS.tolist(),
+            'regions': REGIONS,
+            'crop_types': CROP_TYPES,
+            'metrics': METRICS,
+            'timeseries_variables': TIMESERIES_VARIABLES
+        }, f, ensure_ascii=False, indent=2)
+
+    return output_dir
+
+
+def load_scenario_table(table_dir=DEFAULT_TABLE_DIR):
+    """
+    Memory-map a table written by build_scenario_table.
+
+    Parameters:
+    -----------
+    table_dir : str
+        Directory holding the table
+
+    Returns:
+    --------
+    dict or None
+        Dictionary with the 'index' and the read-only 'metrics' and
+        'timeseries' arrays, or None when the table has not been built
+    """
+    index_path = os.path.join(table_dir, 'index.json')
+    if not os.path.exists(index_path):
+        return None
+
+    with open(index_path, encoding='utf-8') as f:
+        index = json.load(f)
+
+    return {
+        'index': index,
+        'metrics': np.load(os.path.join(table_dir, 'metrics.npy'), mmap_mode='r'),
+        'timeseries': np.load(os.path.join(table_dir, 'timeseries.npy'), mmap_mode='r')
+    }
+
+
+def _position(values, value):
+    """Return the index of `value` in `values` or raise KeyError."""
+    matches = np.flatnonzero(np.isclose(values, value))
+    if len(matches) == 0:
+        raise KeyError(f"{value} is not on the scenario table grid")
+    return int(matches[0])
+
+
+def lookup_metrics(table, bee_percentage, ecosystem_resilience, region, crop_type):
+    """
+    Read the metric cards of one slider position from the table.
+
+    Parameters:
+    -----------
+    table : dict
+        Table returned by load_scenario_table
+    bee_percentage : float
+        Percentage of bee population on the slider grid
+    ecosystem_resilience : float
+        One of the resilience levels
+    region : str
+        One of the indexed regions
+    crop_type : str
+        One of the indexed crop types
+
+    Returns:
+    --------
+    dict
+        Mapping of each metric name to its value
+    """
+    index = table['index']
+    b = _position(index['bee_percentage'], bee_percentage)
+    r = _position(index['resilience'], ecosystem_resilience)
+    g = index['regions'].index(region)
+    c = index['crop_types'].index(crop_type)
+    values = table['metrics'][:, b, r, g, c]
+    return {name: float(value) for name, value in zip(index['metrics'], values)}
+
+
+def lookup_timeseries(table, bee_percentage, years, ecosystem_resilience):
+    """
+    Read one ecosystem simulation from the table.
+
+    Parameters:
+    -----------
+    table : dict
+        Table returned by load_scenario_table
+    bee_percentage : float
+        Percentage of bee population on the slider grid
+    years : int
+        Number of years simulated (1-50)
+    ecosystem_resilience : float
+        One of the resilience levels
+
+    Returns:
+    --------
+    pd.DataFrame
+        Dataframe with the same columns as create_ecosystem_simulation
+    """
+    index = table['index']
+    b = _position(index['bee_percentage'], bee_percentage)
+    r = _position(index['resilience'], ecosystem_resilience)
+    y = _position(index['years'], years)
+    n_steps = int(years) * 12
+
+    series = np.asarray(table['timeseries'][b, r, y, :, :n_steps], dtype=float)
+    import pandas as pd
+    df = pd.DataFrame(dict(zip(index['timeseries_variables'], series)))
+    df.insert(0, 'time', np.linspace(0, years, n_steps))
+    return df
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scenario lookup table for the bee impact simulator")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    build_parser = subparsers.add_parser('build', help="Precompute every slider combination")
+    build_parser.add_argument('--output', default=DEFAULT_TABLE_DIR, help="Output directory")
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        output_dir = build_scenario_table(args.output)
+        print(f"Scenario table written to {output_dir}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,405 @@
+"""
+Region-resolved ecosystem simulation over all Colombian departments at once.
+
+Instead of applying regional effects as scalar multipliers after a single
+national simulation, every department of `get_initial_data()['colombia']`
+is simulated simultaneously: the bee population of each department declines
+from the selected starting level at its own `bee_decline_rate` (percent per
+year), and the biodiversity, crop production and wild plant equations of
+`models` are integrated for all departments as one stacked state array.
+
+Regions of the selector in main.py ("Zona Cafetera", "Todas las regiones",
+...) are aggregations over their departments, so the national view is just
+the aggregation over every department rather than a separate code path.
+
+The metapopulation mode couples the nodes instead: bee populations diffuse
+between neighboring locations through a distance-weighted sparse dispersal
+matrix built from their coordinates, so it scales to municipality-level
+grids without dense N x N memory. simulate_regions switches to it for the
+departments when given a dispersal rate.
+"""
+import numpy as np
+
+# pandas and scipy are imported by the functions that need them, so that
+# the module stays cheap to import from the Streamlit pages and the workers
+
+from core.models import ALPHA, BETA, GAMMA, RECOVERY_RATE
+from core.instrumentation import instrumented
+
+VARIABLES = ['biodiversity', 'crop_production', 'wild_plants', 'bee_population']
+
+EARTH_RADIUS_KM = 6371.0
+DEFAULT_DISPERSAL_RADIUS_KM = 150.0  # Neighbors farther apart than this are not coupled
+DEFAULT_DISPERSAL_RATE = 0.1  # Share of the population difference exchanged per year
+
+# Departments aggregated by each region of scenarios.REGIONS. Regions that
+# are not a single department group the departments they span; Amazonia has
+# no department in the dataset and therefore no regional simulation.
+REGION_DEPARTMENTS = {
+    "Zona Cafetera": ["Caldas", "Risaralda", "Quindío"],
+    "Valle del Cauca": ["Valle del Cauca"],
+    "Antioquia": ["Antioquia"],
+    "Santander": ["Santander"],
+    "Boyacá": ["Boyacá"],
+    "Cundinamarca": ["Cundinamarca"],
+    "Huila": ["Huila"],
+    "Cauca": ["Cauca"],
+    "Amazonia": []
+}
+
+
+def bee_trajectories(bee_percentage, decline_rates, t):
+    """
+    Bee population of every department over time.
+
+    Each department starts at `bee_percentage` and loses `decline_rate`
+    percent of its remaining population per year (compound decline).
+
+    Parameters:
+    -----------
+    bee_percentage : float
+        Initial percentage of bee population (0-100)
+    decline_rates : array-like
+        Annual bee decline rate (%) of each department
+    t : np.ndarray
+        Time points (in years)
+
+    Returns:
+    --------
+    np.ndarray
+        Normalized bee population (0-1), shape (n_departments, len(t))
+    """
+    decline_rates = np.asarray(decline_rates, dtype=float)
+    log_retention = np.log1p(-decline_rates / 100)[:, np.newaxis]
+    return bee_percentage / 100 * np.exp(log_retention * t)
+
+
+@instrumented()
+def simulate_regions(bee_percentage, years, ecosystem_resilience, departments=None, dispersal_rate=0.0):
+    """
+    Simulate the ecosystem of every department in a single integration.
+
+    The state of all departments is one (n_departments, 3) array of
+    biodiversity, crop production and wild plants, advanced by a vectorized
+    right-hand side; the bee population is the declining trajectory of
+    bee_trajectories. With a positive `dispersal_rate` the departments are
+    the nodes of simulate_metapopulation instead, placed at their capitals,
+    and bees move between neighboring departments.
+
+    Parameters:
+    -----------
+    bee_percentage : float
+        Initial percentage of bee population (0-100)
+    years : int
+        Number of years to simulate
+    ecosystem_resilience : float or array-like
+        Ecosystem resilience factor (0-1), shared or one value per department
+    departments : pd.DataFrame, optional
+        Department table with 'department', 'bee_decline_rate' and
+        'pollinator_dependent_crops_value' columns, plus 'lat' and 'lon' when
+        dispersing (default: the 'colombia' table of get_initial_data())
+    dispersal_rate : float
+        Dispersal coefficient (per year) of simulate_metapopulation; 0 keeps
+        the departments independent
+
+    Returns:
+    --------
+    dict
+        Dictionary with:
+        - 'variables': names of the state variables along axis 1 of 'states'
+        - 'departments': department names, shape (n_departments,)
+        - 'crops_value': pollinator dependent crops value of each department
+        - 'time': time points in years, shape (n_steps,)
+        - 'states': percentages of the optimal level, shape (n_departments, 4, n_steps)
+    """
+    if departments is None:
+        from core.data_module import get_initial_data
+        departments = get_initial_data()['colombia']
+
+    if dispersal_rate > 0:
+        simulation = simulate_metapopulation(
+            bee_percentage, years, ecosystem_resilience, departments['lat'].values,
+            departments['lon'].values, departments['bee_decline_rate'].values, dispersal_rate
+        )
+        return {
+            'variables': VARIABLES,
+            'departments': departments['department'].values,
+            'crops_value': departments['pollinator_dependent_crops_value'].values.astype(float),
+            'time': simulation['time'],
+            'states': simulation['states']
+        }
+
+    n_departments = len(departments)
+    t = np.linspace(0, years, years * 12)  # Monthly intervals, as in create_ecosystem_simulation
+    bee = bee_trajectories(bee_percentage, departments['bee_decline_rate'].values, t)
+    decline = np.log1p(-departments['bee_decline_rate'].values / 100)
+    recovery = np.broadcast_to(
+        np.asarray(ecosystem_resilience, dtype=float) * RECOVERY_RATE, (n_departments,)
+    )
+    rates = np.array([ALPHA, BETA, GAMMA])[:, np.newaxis]
+
+    def regional_model(y, time):
+        biodiversity, crop_production, wild_plants = y.reshape(3, n_departments)
+        bee_pop = bee_percentage / 100 * np.exp(decline * time)
+
+        # Same equations as models.create_ecosystem_simulation, per department
+        loss = rates * (1 - bee_pop)
+        dbio_dt = -loss[0] * biodiversity + recovery * (1 - biodiversity)
+        dcrop_dt = -loss[1] * crop_production
+        dwild_dt = -loss[2] * wild_plants
+
+        return np.concatenate([dbio_dt, dcrop_dt, dwild_dt])
+
+    from scipy.integrate import odeint
+    solution = odeint(regional_model, np.ones(3 * n_departments), t)
+
+    states = np.empty((n_departments, len(VARIABLES), len(t)))
+    states[:, :3] = solution.T.reshape(3, n_departments, len(t)).transpose(1, 0, 2)
+    states[:, 3] = bee
+    states *= 100  # Scale to percentage
+
+    return {
+        'variables': VARIABLES,
+        'departments': departments['department'].values,
+        'crops_value': departments['pollinator_dependent_crops_value'].values.astype(float),
+        'time': t,
+        'states': states
+    }
+
+
+def region_departments(simulation, region):
+    """
+    Indices of the departments aggregated by a region.
+
+    Parameters:
+    -----------
+    simulation : dict
+        Result of simulate_regions
+    region : str
+        One of scenarios.REGIONS; "Todas las regiones" selects every department
+
+    Returns:
+    --------
+    np.ndarray
+        Indices along axis 0 of simulation['states']
+    """
+    if region == "Todas las regiones":
+        return np.arange(len(simulation['departments']))
+    if region not in REGION_DEPARTMENTS:
+        raise KeyError(f"Unknown region '{region}'")
+    selected = np.flatnonzero(np.isin(simulation['departments'], REGION_DEPARTMENTS[region]))
+    if len(selected) == 0:
+        raise KeyError(f"No department data for region '{region}'")
+    return selected
+
+
+def aggregate_region(simulation, region="Todas las regiones"):
+    """
+    Aggregate the department trajectories of a region.
+
+    Crop production is weighted by each department's pollinator dependent
+    crops value; biodiversity, wild plants and bee population are plain
+    means over the departments.
+
+    Parameters:
+    -----------
+    simulation : dict
+        Result of simulate_regions
+    region : str
+        One of scenarios.REGIONS
+
+    Returns:
+    --------
+    pd.DataFrame
+        Dataframe with the same columns as create_ecosystem_simulation
+    """
+    selected = region_departments(simulation, region)
+    states = simulation['states'][selected]
+
+    aggregated = states.mean(axis=0)
+    aggregated[1] = np.average(states[:, 1], axis=0, weights=simulation['crops_value'][selected])
+
+    import pandas as pd
+    df = pd.DataFrame(dict(zip(simulation['variables'], aggregated)))
+    df.insert(0, 'time', simulation['time'])
+    return df
+
+
+def department_summary(simulation, region="Todas las regiones"):
+    """
+    State of each department of a region at the end of the horizon.
+
+    Parameters:
+    -----------
+    simulation : dict
+        Result of simulate_regions
+    region : str
+        One of scenarios.REGIONS
+
+    Returns:
+    --------
+    pd.DataFrame
+        One row per department with 'department', 'crops_value' and the
+        final value of each state variable
+    """
+    import pandas as pd
+
+    selected = region_departments(simulation, region)
+    df = pd.DataFrame({
+        'department': simulation['departments'][selected],
+        'crops_value': simulation['crops_value'][selected]
+    })
+    for v, name in enumerate(simulation['variables']):
+        df[name] = simulation['states'][selected, v, -1]
+    return df
+
+
+def _unit_vectors(lat, lon):
+    """Convert latitude/longitude in degrees to 3-D points on the unit sphere."""
+    lat = np.radians(np.asarray(lat, dtype=float))
+    lon = np.radians(np.asarray(lon, dtype=float))
+    return np.column_stack([np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)])
+
+
+def dispersal_matrix(lat, lon, radius_km=DEFAULT_DISPERSAL_RADIUS_KM, scale_km=None):
+    """
+    Distance-weighted sparse coupling matrix between locations.
+
+    Only pairs closer than `radius_km` are found (with a KD-tree, without
+    forming the dense distance matrix) and weighted by exp(-distance / scale_km).
+
+    Parameters:
+    -----------
+    lat, lon : array-like
+        Coordinates of each node in degrees
+    radius_km : float
+        Maximum great-circle distance between coupled nodes
+    scale_km : float, optional
+        Distance decay scale (default: radius_km / 2)
+
+    Returns:
+    --------
+    scipy.sparse.csr_matrix
+        Symmetric (n_nodes, n_nodes) weight matrix with an empty diagonal
+    """
+    scale_km = scale_km or radius_km / 2
+    from scipy import sparse
+    from scipy.spatial import cKDTree
+
+    points = _unit_vectors(lat, lon)
+    tree = cKDTree(points)
+
+    # Chord length on the unit sphere equivalent to the great-circle radius
+    max_chord = 2 * np.sin(min(radius_km / EARTH_RADIUS_KM, np.pi) / 2)
+    pairs = tree.sparse_distance_matrix(tree, max_chord, output_type='coo_matrix')
+    off_diagonal = pairs.row != pairs.col
+    rows, cols = pairs.row[off_diagonal], pairs.col[off_diagonal]
+
+    # Chord to great-circle distance
+    distance_km = 2 * np.arcsin(np.clip(pairs.data[off_diagonal] / 2, 0, 1)) * EARTH_RADIUS_KM
+    weights = np.exp(-distance_km / scale_km)
+    return sparse.csr_matrix((weights, (rows, cols)), shape=(len(points), len(points)))
+
+
+def _metapopulation_jacobian(y, n_nodes, decline, recovery, coupling):
+    """Sparse Jacobian of the metapopulation model, variables stacked by block."""
+    biodiversity, crop_production, wild_plants, bee_pop = y.reshape(4, n_nodes)
+    missing = 1 - bee_pop
+    from scipy import sparse
+    diag = sparse.diags
+    return sparse.bmat([
+        [diag(-ALPHA * missing - recovery), None, None, diag(ALPHA * biodiversity)],
+        [None, diag(-BETA * missing), None, diag(BETA * crop_production)],
+        [None, None, diag(-GAMMA * missing), diag(GAMMA * wild_plants)],
+        [None, None, None, coupling + diag(decline)]
+    ], format='csc')
+
+
+def simulate_metapopulation(bee_percentage, years, ecosystem_resilience, lat, lon, decline_rates,
+                            dispersal_rate=DEFAULT_DISPERSAL_RATE, radius_km=DEFAULT_DISPERSAL_RADIUS_KM,
+                            method='BDF'):
+    """
+    Simulate coupled locations whose bee populations diffuse between neighbors.
+
+    Each node follows the ecosystem equations of simulate_regions, with its
+    bee population declining at its own rate and exchanging bees with the
+    nodes within `radius_km`:
+
+        dP_i/dt = log(1 - r_i) P_i + dispersal_rate * sum_j W_ij (P_j - P_i)
+
+    where W is the dispersal_matrix. The model is integrated with a stiff
+    solver and a sparse analytic Jacobian, so memory grows with the number
+    of neighbor pairs rather than with the square of the number of nodes.
+
+    Parameters:
+    -----------
+    bee_percentage : float or array-like
+        Initial percentage of bee population (0-100), shared or one per node
+    years : int
+        Number of years to simulate
+    ecosystem_resilience : float or array-like
+        Ecosystem resilience factor (0-1), shared or one per node
+    lat, lon : array-like
+        Coordinates of each node in degrees
+    decline_rates : array-like
+        Annual bee decline rate (%) of each node
+    dispersal_rate : float
+        Dispersal coefficient (per year); 0 decouples the nodes
+    radius_km : float
+        Maximum distance between coupled nodes
+    method : str
+        scipy.integrate.solve_ivp method; 'BDF' and 'Radau' use the sparse Jacobian
+
+    Returns:
+    --------
+    dict
+        Dictionary with:
+        - 'variables': names of the state variables along axis 1 of 'states'
+        - 'time': time points in years, shape (n_steps,)
+        - 'states': percentages of the optimal level, shape (n_nodes, 4, n_steps)
+        - 'dispersal': the sparse dispersal matrix
+    """
+    n_nodes = len(np.atleast_1d(lat))
+    t = np.linspace(0, years, years * 12)  # Monthly intervals, as in create_ecosystem_simulation
+
+    bee0 = np.broadcast_to(np.asarray(bee_percentage, dtype=float) / 100, (n_nodes,))
+    recovery = np.broadcast_to(np.asarray(ecosystem_resilience, dtype=float) * RECOVERY_RATE, (n_nodes,))
+    decline = np.log1p(-np.asarray(decline_rates, dtype=float) / 100)
+
+    from scipy import sparse
+    from scipy.integrate import solve_ivp
+
+    weights = dispersal_matrix(lat, lon, radius_km)
+    # Graph Laplacian: inflow from neighbors minus outflow to them
+    coupling = (dispersal_rate * (weights - sparse.diags(np.asarray(weights.sum(axis=1)).ravel()))).tocsr()
+
+    def metapopulation_model(time, y):
+        biodiversity, crop_production, wild_plants, bee_pop = y.reshape(4, n_nodes)
+        missing = 1 - bee_pop
+
+        dbio_dt = -ALPHA * missing * biodiversity + recovery * (1 - biodiversity)
+        dcrop_dt = -BETA * missing * crop_production
+        dwild_dt = -GAMMA * missing * wild_plants
+        dbee_dt = decline * bee_pop + coupling @ bee_pop
+
+        return np.concatenate([dbio_dt, dcrop_dt, dwild_dt, dbee_dt])
+
+    def jacobian(time, y):
+        return _metapopulation_jacobian(y, n_nodes, decline, recovery, coupling)
+
+    initial_state = np.concatenate([np.ones(3 * n_nodes), bee0])
+    solution = solve_ivp(
+        metapopulation_model, (t[0], t[-1]), initial_state, method=method, t_eval=t,
+        jac=jacobian if method in ('BDF', 'Radau') else None, rtol=1e-6, atol=1e-8
+    )
+    if not solution.success:
+        raise RuntimeError(f"Metapopulation integration failed: {solution.message}")
+
+    states = solution.y.reshape(4, n_nodes, len(t)).transpose(1, 0, 2) * 100  # Scale to percentage
+
+    return {
+        'variables': VARIABLES,
+        'time': t,
+        'states': states,
+        'dispersal': weights
+    }
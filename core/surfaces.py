@@ -0,0 +1,132 @@
+"""
+Grids and surfaces of the model indices, as plotted by the 3D figures.
+
+visualizations.py turns these arrays into Plotly figures and caches them;
+computing them here keeps the figure data available to scripts and batch
+exports without Plotly or Streamlit.
+"""
+import numpy as np
+
+from core.models import calculate_biodiversity_impact, calculate_crop_production
+
+# Axis ranges of the biodiversity surface, matching the main page sliders
+BEE_BOUNDS = (10, 100)
+RESILIENCE_BOUNDS = (0.2, 1.0)
+
+
+def crop_time_factor(bee_percentage, time, years):
+    """
+    Long-term decline factor applied to crop production when the bee
+    population stays below 50%.
+
+    Parameters:
+    -----------
+    bee_percentage : float or np.ndarray
+        Bee population percentage
+    time : float or np.ndarray
+        Elapsed time in years, broadcast against `bee_percentage`
+    years : int
+        Simulation horizon in years
+
+    Returns:
+    --------
+    np.ndarray
+        Multiplicative factor between 0.5 and 1
+    """
+    bee_percentage = np.asarray(bee_percentage, dtype=float)
+    decline = np.maximum(0.5, 1.0 - (time / years) * (0.1 * (50 - bee_percentage) / 50))
+    return np.where(bee_percentage < 50, decline, 1.0)
+
+
+def crop_production_surface(years=10, resolution=(40, 20)):
+    """
+    Crop production over the bee population x time plane.
+
+    Parameters:
+    -----------
+    years : int
+        Simulation horizon in years
+    resolution : tuple of int
+        Number of points along the bee population and time axes
+
+    Returns:
+    --------
+    tuple of np.ndarray
+        (bee_range, time_range, crop_grid), where crop_grid has shape
+        (len(time_range), len(bee_range))
+    """
+    bee_points, time_points = resolution
+
+    # Generate bee population range
+    bee_range = np.linspace(0, 100, bee_points)
+
+    # Generate time range
+    time_range = np.linspace(0, years, time_points)
+
+    # Base crop production based on bee population, with the long-term
+    # decline over time when the bee population is low (time along rows)
+    crop_grid = calculate_crop_production(bee_range) * crop_time_factor(
+        bee_range, time_range[:, np.newaxis], years
+    )
+    return bee_range, time_range, crop_grid
+
+
+def adaptive_axis(low, high, n_points, density):
+    """
+    Place `n_points` between `low` and `high` with spacing inversely
+    proportional to `density`, evaluated on a fine reference grid.
+    """
+    reference = np.linspace(low, high, 1001)
+    weights = density(reference)
+    cdf = np.concatenate([[0.0], np.cumsum((weights[1:] + weights[:-1]) / 2)])
+    cdf /= cdf[-1]
+    return np.interp(np.linspace(0, 1, n_points), cdf, reference)
+
+
+def biodiversity_surface(resolution=(30, 30), adaptive=False):
+    """
+    Biodiversity index over the bee population x resilience plane.
+
+    Parameters:
+    -----------
+    resolution : tuple of int
+        Number of points along the bee population and resilience axes
+    adaptive : bool
+        Concentrate points where the sigmoid is steepest, around its
+        inflection, instead of spacing them evenly
+
+    Returns:
+    --------
+    tuple of np.ndarray
+        (bee_range, resilience_range, biodiversity_values), where
+        biodiversity_values has shape (len(resilience_range), len(bee_range))
+    """
+    bee_points, resilience_points = resolution
+
+    if adaptive:
+        # Sigmoid slope averaged over the other axis, plus a floor so the
+        # flat regions keep some points
+        probe_bee = np.linspace(*BEE_BOUNDS, 64)
+        probe_resilience = np.linspace(*RESILIENCE_BOUNDS, 64)
+
+        def slope(values):
+            return values / 100 * (1 - values / 100)
+
+        def bee_density(bee):
+            bio = calculate_biodiversity_impact(bee[:, np.newaxis], probe_resilience)
+            weights = slope(bio).mean(axis=1)
+            return 0.25 + weights / weights.max()
+
+        def resilience_density(resilience):
+            bio = calculate_biodiversity_impact(probe_bee, resilience[:, np.newaxis])
+            weights = slope(bio).mean(axis=1)
+            return 0.25 + weights / weights.max()
+
+        bee_range = adaptive_axis(*BEE_BOUNDS, bee_points, bee_density)
+        resilience_range = adaptive_axis(*RESILIENCE_BOUNDS, resilience_points, resilience_density)
+    else:
+        bee_range = np.linspace(*BEE_BOUNDS, bee_points)
+        resilience_range = np.linspace(*RESILIENCE_BOUNDS, resilience_points)
+
+    biodiversity_values = calculate_biodiversity_impact(bee_range, resilience_range[:, np.newaxis])
+    return bee_range, resilience_range, biodiversity_values
@@ -0,0 +1,264 @@
+"""
+Monte Carlo uncertainty engine for the crop and biodiversity projections.
+
+The model parameters in `models` are point estimates. This module samples
+them from user-specified distributions, evaluates the draws in vectorized
+batches and accumulates percentile bands with fixed-size streaming
+histograms, so memory stays bounded no matter how many draws are run.
+"""
+import numpy as np
+
+from core.models import (
+    ALPHA, BETA, GAMMA, BEE_DEPENDENT_SHARE, SIGMOID_STEEPNESS,
+    _analytic_trajectories, calculate_biodiversity_impact, calculate_crop_production
+)
+
+
+class Uniform:
+    """
+    Uniform distribution on [loc, loc + scale].
+
+    Draws the same values as scipy.stats.uniform(loc, scale) for the same
+    generator, without importing scipy for the default distributions.
+    """
+
+    def __init__(self, loc=0.0, scale=1.0):
+        self.loc = loc
+        self.scale = scale
+
+    def rvs(self, size=None, random_state=None):
+        rng = np.random.default_rng(random_state)
+        return self.loc + self.scale * rng.uniform(0.0, 1.0, size)
+
+
+# Default parameter distributions: uniform within ±20% of the point estimates
+DEFAULT_DISTRIBUTIONS = {
+    'alpha': Uniform(loc=0.8 * ALPHA, scale=0.4 * ALPHA),
+    'beta': Uniform(loc=0.8 * BETA, scale=0.4 * BETA),
+    'gamma': Uniform(loc=0.8 * GAMMA, scale=0.4 * GAMMA),
+    'bee_dependent_share': Uniform(loc=0.8 * BEE_DEPENDENT_SHARE, scale=0.4 * BEE_DEPENDENT_SHARE),
+    'steepness': Uniform(loc=0.8 * SIGMOID_STEEPNESS, scale=0.4 * SIGMOID_STEEPNESS)
+}
+
+DEFAULT_PERCENTILES = (5, 50, 95)
+
+# Trajectories with parameter uncertainty; the bee population is an input
+UNCERTAIN_VARIABLES = ['biodiversity', 'crop_production', 'wild_plants']
+
+
+class StreamingQuantiles:
+    """
+    Online quantile estimator over a fixed value range.
+
+    Each tracked quantity keeps a histogram of `bins` counts between `low`
+    and `high`; quantiles are read back by linear interpolation inside the
+    bins, so the resolution is (high - low) / bins and the memory does not
+    grow with the number of observations.
+
+    Parameters:
+    -----------
+    shape : tuple of int
+        Shape of one observation (e.g. (n_variables, n_steps))
+    low, high : float
+        Value range; observations outside it are clipped
+    bins : int
+        Number of histogram bins per tracked quantity
+    """
+
+    def __init__(self, shape, low=0.0, high=100.0, bins=1000):
+        self.shape = tuple(shape)
+        self.low = low
+        self.high = high
+        self.bins = bins
+        self.count = 0
+        self._size = int(np.prod(self.shape))
+        self._counts = np.zeros((self._size, bins), dtype=np.int64)
+        self._min = np.full(self._size, np.inf)
+        self._max = np.full(self._size, -np.inf)
+
+    def update(self, batch):
+        """
+        Add a batch of observations of shape (n,) + shape.
+        """
+        batch = np.asarray(batch, dtype=float).reshape(-1, self._size)
+        scaled = (batch - self.low) / (self.high - self.low) * self.bins
+        bin_index = np.clip(scaled.astype(np.int64), 0, self.bins - 1)
+        flat_index = np.arange(self._size) * self.bins + bin_index
+        self._counts += np.bincount(flat_index.ravel(), minlength=self._counts.size).reshape(self._counts.shape)
+        self._min = np.minimum(self._min, batch.min(axis=0))
+        self._max = np.maximum(self._max, batch.max(axis=0))
+        self.count += batch.shape[0]
+
+    def percentiles(self, percentiles):
+        """
+        Estimate percentiles of every tracked quantity.
+
+        Parameters:
+        -----------
+        percentiles : sequence of float
+            Percentiles to estimate (0-100)
+
+        Returns:
+        --------
+        np.ndarray
+            Array of shape (len(percentiles),) + shape
+        """
+        cumulative = np.cumsum(self._counts, axis=1)
+        width = (self.high - self.low) / self.bins
+        result = np.empty((len(percentiles), self._size))
+        for p, percentile in enumerate(percentiles):
+            target = percentile / 100 * self.count
+            # First bin whose cumulative count reaches the target
+            index = np.minimum((cumulative < target).sum(axis=1), self.bins - 1)
+            rows = np.arange(self._size)
+            before = np.where(index > 0, cumulative[rows, np.maximum(index - 1, 0)], 0)
+            in_bin = self._counts[rows, index]
+            fraction = np.divide(target - before, in_bin, out=np.full(self._size, 0.5), where=in_bin > 0)
+            estimate = self.low + (index + np.clip(fraction, 0, 1)) * width
+            # Never report values outside the observed range
+            result[p] = np.clip(estimate, self._min, self._max)
+        return result.reshape((len(percentiles),) + self.shape)
+
+
+def sample_parameters(n_draws, distributions=None, random_state=None):
+    """
+    Draw model parameters.
+
+    Parameters:
+    -----------
+    n_draws : int
+        Number of parameter sets
+    distributions : dict, optional
+        Mapping of parameter name ('alpha', 'beta', 'gamma',
+        'bee_dependent_share', 'steepness') to a scipy.stats frozen
+        distribution, any object with an `rvs(size, random_state)` method,
+        or a fixed number. Missing parameters use DEFAULT_DISTRIBUTIONS.
+    random_state : int or np.random.Generator, optional
+        Seed or generator for reproducible draws
+
+    Returns:
+    --------
+    dict
+        Mapping of parameter name to an array of `n_draws` values
+    """
+    rng = np.random.default_rng(random_state)
+    distributions = {**DEFAULT_DISTRIBUTIONS, **(distributions or {})}
+    samples = {}
+    for name, distribution in distributions.items():
+        if hasattr(distribution, 'rvs'):
+            samples[name] = np.asarray(distribution.rvs(size=n_draws, random_state=rng), dtype=float)
+        else:
+            samples[name] = np.full(n_draws, float(distribution))
+    return samples
+
+
+def iter_monte_carlo(bee_percentage, years, ecosystem_resilience, n_draws=10000, batch_size=2000,
+                     distributions=None, percentiles=DEFAULT_PERCENTILES, random_state=None, bins=1000,
+                     report_every=1):
+    """
+    Run the Monte Carlo simulation in batches, yielding the percentile bands
+    accumulated so far every `report_every` batches and after the last one.
+
+    Reading the bands back from the quantile estimators costs more than
+    simulating a batch, so callers that only need the final bands should
+    pass report_every=None.
+
+    Parameters:
+    -----------
+    bee_percentage : float
+        Percentage of bee population (0-100)
+    years : int
+        Number of years to simulate
+    ecosystem_resilience : float
+        Ecosystem resilience factor (0-1)
+    n_draws : int
+        Total number of parameter draws
+    batch_size : int
+        Number of draws evaluated together
+    distributions : dict, optional
+        Parameter distributions, see sample_parameters
+    percentiles : sequence of float
+        Percentiles of the bands
+    random_state : int or np.random.Generator, optional
+        Seed or generator for reproducible draws
+    bins : int
+        Histogram resolution of the streaming quantile estimators
+    report_every : int or None
+        Number of batches between yields; None yields only the final bands
+
+    Yields:
+    -------
+    dict
+        Dictionary with 'draws' (completed so far), 'bands' (DataFrame with
+        'time' and '<variable>_p<percentile>' columns) and 'indices'
+        (percentiles of the crop production and biodiversity indices)
+    """
+    import pandas as pd
+
+    rng = np.random.default_rng(random_state)
+    t = np.linspace(0, years, years * 12)  # Monthly intervals, as in create_ecosystem_simulation
+
+    trajectory_quantiles = StreamingQuantiles((len(UNCERTAIN_VARIABLES), len(t)), bins=bins)
+    index_quantiles = StreamingQuantiles((2,), bins=bins)
+
+    done = 0
+    batches = 0
+    while done < n_draws:
+        size = min(batch_size, n_draws - done)
+        params = sample_parameters(size, distributions, rng)
+
+        states = _analytic_trajectories(
+            bee_percentage / 100, ecosystem_resilience, t,
+            alpha=params['alpha'], beta=params['beta'], gamma=params['gamma']
+        )
+        trajectory_quantiles.update(states[:, :len(UNCERTAIN_VARIABLES)] * 100)
+
+        indices = np.stack([
+            calculate_crop_production(bee_percentage, params['bee_dependent_share']),
+            calculate_biodiversity_impact(bee_percentage, ecosystem_resilience, params['steepness'])
+        ], axis=1)
+        index_quantiles.update(indices)
+
+        done += size
+        batches += 1
+        if done < n_draws and (report_every is None or batches % report_every):
+            continue
+        yield {
+            'draws': done,
+            'bands': _bands_frame(t, trajectory_quantiles.percentiles(percentiles), percentiles),
+            'indices': pd.DataFrame(
+                index_quantiles.percentiles(percentiles),
+                index=[f'p{p:g}' for p in percentiles],
+                columns=['crop_production', 'biodiversity']
+            )
+        }
+
+
+def run_monte_carlo(bee_percentage, years, ecosystem_resilience, **kwargs):
+    """
+    Run the full Monte Carlo simulation and return the final percentile bands.
+
+    Accepts the same arguments as iter_monte_carlo; the bands are only read
+    back once, after the last batch.
+
+    Returns:
+    --------
+    dict
+        The last result yielded by iter_monte_carlo
+    """
+    kwargs.setdefault('report_every', None)
+    result = None
+    for result in iter_monte_carlo(bee_percentage, years, ecosystem_resilience, **kwargs):
+        pass
+    return result
+
+
+def _bands_frame(t, values, percentiles):
+    """Flatten (percentile, variable, time) values into a bands DataFrame."""
+    import pandas as pd
+
+    columns = {'time': t}
+    for v, name in enumerate(UNCERTAIN_VARIABLES):
+        for p, percentile in enumerate(percentiles):
+            columns[f'{name}_p{percentile:g}'] = values[p, v]
+    return pd.DataFrame(columns)
@@ -1,3 +1,33 @@
+"""
+Risk regions of Colombia for the map visualizations.
+
+`get_risk_regions` is the source list of region records. The app reads them
+through a columnar RegionTable instead: a struct-of-arrays with float32
+coordinates, a categorical risk level and dictionary-encoded (interned)
+strings, which can be saved to and memory-mapped from a directory of `.npy`
+files or loaded from a Parquet file, so memory and load time stay flat as
+the dataset grows to farm-level records.
+
+Build the table with:
+
+    python -m data.regions build [--output PATH]
+"""
+import argparse
+import json
+import os
+
+import numpy as np
+
+REGION_TABLE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'region_table')
+
+# Ordered risk categories
+RISK_LEVELS = ["Bajo", "Medio", "Alto"]
+
+# Dictionary-encoded string columns; each row stores an index into the column's categories
+CATEGORICAL_COLUMNS = ['name', 'risk', 'crops', 'description']
+NUMERIC_COLUMNS = {'lat': np.float32, 'lon': np.float32, 'dependency': np.float32}
+
+
 def get_risk_regions():
     """
     Returns a list of regions with pollinator risk data in Colombia.
@@ -145,4 +175,261 @@ def get_risk_regions():
         }
     ]
     
-    return regions
\ No newline at end of file
+    return regions
+
+
+class RegionTable:
+    """
+    Columnar, read-only table of region records.
+
+    Numeric columns are stored as float32 arrays and string columns as
+    integer codes into a list of categories, so every distinct string is
+    kept once however many rows use it.
+
+    Parameters:
+    -----------
+    columns : dict
+        Mapping of column name to a 1-D array; for the columns in
+        CATEGORICAL_COLUMNS the array holds category codes
+    categories : dict
+        Mapping of each categorical column to its list of categories
+    """
+
+    def __init__(self, columns, categories):
+        self.columns = {}
+        for name, values in columns.items():
+            values = np.asarray(values)
+            if values.flags.writeable:
+                values = values.view()
+                values.flags.writeable = False
+            self.columns[name] = values
+        self.categories = {name: list(values) for name, values in categories.items()}
+
+    def __len__(self):
+        return len(self.columns['lat'])
+
+    def codes(self, name, values):
+        """
+        Category codes of `values` in column `name`; unknown values are skipped.
+
+        Parameters:
+        -----------
+        name : str
+            Categorical column
+        values : iterable of str
+            Category values
+
+        Returns:
+        --------
+        np.ndarray
+            Integer codes
+        """
+        lookup = {value: code for code, value in enumerate(self.categories[name])}
+        return np.array([lookup[value] for value in values if value in lookup], dtype=np.int64)
+
+    def decode(self, name, rows=None):
+        """
+        Values of one column, with categorical codes resolved to strings.
+
+        Parameters:
+        -----------
+        name : str
+            Column name
+        rows : array-like of int, optional
+            Rows to read (default: all)
+
+        Returns:
+        --------
+        np.ndarray
+            Column values
+        """
+        values = self.columns[name] if rows is None else self.columns[name][rows]
+        if name in self.categories:
+            return np.asarray(self.categories[name], dtype=object)[values]
+        return values
+
+    def records(self, rows=None):
+        """
+        Region dictionaries, in the format of get_risk_regions(), for some rows.
+
+        Parameters:
+        -----------
+        rows : array-like of int, optional
+            Rows to convert (default: all)
+
+        Returns:
+        --------
+        list of dict
+            One dictionary per row
+        """
+        rows = np.arange(len(self)) if rows is None else np.asarray(rows, dtype=np.int64)
+        decoded = {name: self.decode(name, rows).tolist() for name in self.columns}
+        # float32 resolves about 1e-5 degrees (~1 m); drop the conversion noise
+        for name in ('lat', 'lon'):
+            decoded[name] = [round(value, 5) for value in decoded[name]]
+        decoded['dependency'] = [int(value) if float(value).is_integer() else value
+                                 for value in decoded['dependency']]
+        return [dict(zip(decoded, values)) for values in zip(*decoded.values())]
+
+    def frame(self):
+        """
+        Read-only pandas view of the table.
+
+        Numeric columns share memory with the table and string columns are
+        pandas Categoricals over the table's codes.
+
+        Returns:
+        --------
+        pd.DataFrame
+            One row per region
+        """
+        import pandas as pd
+
+        data = {}
+        for name, values in self.columns.items():
+            if name in self.categories:
+                data[name] = pd.Categorical.from_codes(
+                    values, self.categories[name], ordered=(name == 'risk')
+                )
+            else:
+                data[name] = values
+        return pd.DataFrame(data, copy=False)
+
+
+def build_region_table(records=None):
+    """
+    Convert region dictionaries into a RegionTable.
+
+    Parameters:
+    -----------
+    records : list of dict, optional
+        Region records (default: get_risk_regions())
+
+    Returns:
+    --------
+    RegionTable
+        The columnar table
+    """
+    records = get_risk_regions() if records is None else records
+    columns = {
+        name: np.array([record[name] for record in records], dtype=dtype)
+        for name, dtype in NUMERIC_COLUMNS.items()
+    }
+    categories = {}
+    for name in CATEGORICAL_COLUMNS:
+        values = [record[name] for record in records]
+        if name == 'risk':
+            # Fixed order; unknown levels get code -1, as in pandas Categoricals
+            position = {level: code for code, level in enumerate(RISK_LEVELS)}
+            columns[name] = np.array([position.get(value, -1) for value in values], dtype=np.int32)
+            categories[name] = list(RISK_LEVELS)
+        else:
+            # Sorted distinct values, as pandas orders inferred categories
+            unique, codes = np.unique(np.array(values, dtype=object), return_inverse=True)
+            columns[name] = codes.astype(np.int32)
+            categories[name] = unique.tolist()
+    return RegionTable(columns, categories)
+
+
+def save_region_table(table, path=REGION_TABLE_DIR):
+    """
+    Write a RegionTable to a Parquet file (.parquet/.pq) or a directory of .npy files.
+
+    Parameters:
+    -----------
+    table : RegionTable
+        Table to write
+    path : str
+        Output Parquet file or directory
+
+    Returns:
+    --------
+    str
+        The output path
+    """
+    if os.path.splitext(path)[1].lower() in ('.parquet', '.pq'):
+        # pyarrow is only needed for Parquet files
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        arrays = {}
+        for name, values in table.columns.items():
+            if name in table.categories:
+                arrays[name] = pa.DictionaryArray.from_arrays(
+                    pa.array(values, type=pa.int32()), pa.array(table.categories[name], type=pa.string())
+                )
+            else:
+                arrays[name] = pa.array(values)
+        pq.write_table(pa.table(arrays), path)
+        return path
+
+    os.makedirs(path, exist_ok=True)
+    for name, values in table.columns.items():
+        np.save(os.path.join(path, f'{name}.npy'), values)
+    with open(os.path.join(path, 'index.json'), 'w', encoding='utf-8') as f:
+        json.dump({
+            'columns': list(table.columns),
+            'categories': table.categories
+        }, f, ensure_ascii=False, indent=2)
+    return path
+
+
+def load_region_table(path=REGION_TABLE_DIR):
+    """
+    Load a RegionTable written by save_region_table.
+
+    `.npy` columns are memory-mapped read-only. When `path` does not exist
+    the table is built from get_risk_regions().
+
+    Parameters:
+    -----------
+    path : str
+        Parquet file or table directory
+
+    Returns:
+    --------
+    RegionTable
+        The columnar table
+    """
+    if not os.path.exists(path):
+        return build_region_table()
+
+    if os.path.splitext(path)[1].lower() in ('.parquet', '.pq'):
+        import pyarrow.parquet as pq
+
+        parquet = pq.read_table(path)
+        columns = {}
+        categories = {}
+        for name, column in zip(parquet.column_names, parquet.columns):
+            column = column.combine_chunks()
+            if hasattr(column, 'dictionary'):
+                columns[name] = column.indices.to_numpy(zero_copy_only=False)
+                categories[name] = column.dictionary.to_pylist()
+            else:
+                columns[name] = column.to_numpy(zero_copy_only=False)
+        return RegionTable(columns, categories)
+
+    with open(os.path.join(path, 'index.json'), encoding='utf-8') as f:
+        index = json.load(f)
+    columns = {
+        name: np.load(os.path.join(path, f'{name}.npy'), mmap_mode='r')
+        for name in index['columns']
+    }
+    return RegionTable(columns, index['categories'])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Columnar risk region table")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    build_parser = subparsers.add_parser('build', help="Write the region table")
+    build_parser.add_argument('--output', default=REGION_TABLE_DIR,
+                              help="Output directory, or a .parquet file")
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        output = save_region_table(build_region_table(), args.output)
+        print(f"Region table written to {output}")
+
+
+if __name__ == '__main__':
+    main()
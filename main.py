@@ -1,25 +1,41 @@
+import time
+
 import streamlit as st
-import pandas as pd
-import numpy as np
-import plotly.graph_objects as go
-import plotly.express as px
-from streamlit_folium import st_folium
-import streamlit.components.v1 as components
-from models import (
-    calculate_biodiversity_impact, 
-    calculate_crop_production, 
-    create_ecosystem_simulation
-)
+# Figures, solvers and maps are built through the cache module, which imports
+# plotly, scipy and folium on first use; streamlit_folium is imported at the
+# map section, so the page header and controls render before it loads
 from visualizations import (
-    plot_bee_crop_relationship,
-    plot_bee_crop_relationship_3d,
-    plot_biodiversity_impact,
-    plot_biodiversity_impact_3d,
     plot_timeseries_forecast,
-    create_risk_map
+    click_search_distance,
+    region_popup_html,
+    risk_feature_layer,
+    viewport_bounds,
+    MAP_CENTER,
+    MAP_ZOOM
+)
+from cache import (
+    cached_ecosystem_simulation,
+    cached_scenario_metrics,
+    cached_bee_crop_relationship,
+    cached_bee_crop_relationship_3d,
+    cached_biodiversity_impact,
+    cached_biodiversity_impact_3d,
+    cached_timeseries_forecast,
+    cached_uncertainty_bands,
+    cached_regional_simulation,
+    cached_economic_cube,
+    cached_risk_base_map,
+    cached_risk_overlay,
+    cached_region_store
 )
-from data_module import get_initial_data
-from utils import get_emoji, add_vertical_space
+from core.scenarios import REGIONS, CROP_TYPES, CROP_TYPE_CROPS, RESILIENCE_LEVELS, REGION_PARAMETERS
+from core.spatial import (
+    DEFAULT_DISPERSAL_RADIUS_KM, DEFAULT_DISPERSAL_RATE, REGION_DEPARTMENTS,
+    aggregate_region, department_summary, region_departments
+)
+from core.economics import summarize_cube
+from core import instrumentation
+from utils import get_emoji, add_vertical_space, show_instrumentation_panel
 
 # Page configuration
 st.set_page_config(
@@ -29,6 +45,18 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Hidden debug panel: ?debug=1 records wall time and call counts of the model
+# and figure entry points for this rerun, ?debug=alloc also traces allocations
+# Instrumentation is per thread; the script thread is reused by the session's
+# next rerun, so it is switched off again unless that rerun asks for it too
+debug_mode = st.query_params.get("debug")
+if debug_mode:
+    instrumentation.enable(allocations=debug_mode == "alloc")
+    instrumentation.reset()
+else:
+    instrumentation.disable()
+rerun_start = time.perf_counter()
+
 # Custom CSS para tema oscuro/verde
 st.markdown("""
 <style>
@@ -175,8 +203,7 @@ with col1:
     
     selected_region = st.selectbox(
         "Región de Colombia",
-        options=["Todas las regiones", "Zona Cafetera", "Valle del Cauca", "Antioquia", "Santander", 
-                "Boyacá", "Cundinamarca", "Huila", "Cauca", "Amazonia"],
+        options=REGIONS,
         help="Selecciona una región específica para analizar"
     )
     
@@ -190,27 +217,20 @@ with col1:
     
     ecosystem_resilience = st.select_slider(
         "Resiliencia del ecosistema",
-        options=["Muy baja", "Baja", "Media", "Alta", "Muy alta"],
+        options=list(RESILIENCE_LEVELS),
         value="Media",
         help="Capacidad del ecosistema para adaptarse a cambios en los polinizadores"
     )
     
     cultivation_type = st.radio(
         "Tipo de cultivo",
-        options=["Todos", "Café", "Frutales", "Hortalizas", "Cereales"],
+        options=CROP_TYPES,
         horizontal=True,
         help="Tipo de cultivo para enfocar el análisis"
     )
     
     # Convert resilience to numerical value for calculations
-    resilience_mapping = {
-        "Muy baja": 0.2,
-        "Baja": 0.4,
-        "Media": 0.6,
-        "Alta": 0.8,
-        "Muy alta": 1.0
-    }
-    resilience_value = resilience_mapping[ecosystem_resilience]
+    resilience_value = RESILIENCE_LEVELS[ecosystem_resilience]
     
     st.markdown("</div>", unsafe_allow_html=True)
     
@@ -247,9 +267,27 @@ with col1:
 # Right column - Visualizations
 with col2:
     # Calculate impacts based on the slider and parameters
-    biodiversity_impact = calculate_biodiversity_impact(bee_population_percentage, resilience_value)
-    crop_production_impact = calculate_crop_production(bee_population_percentage)
-    ecosystem_data = create_ecosystem_simulation(bee_population_percentage, years_to_simulate, resilience_value)
+    scenario_metrics = cached_scenario_metrics(
+        bee_population_percentage, resilience_value, selected_region, cultivation_type
+    )
+    biodiversity_impact = scenario_metrics['biodiversity']
+    crop_production_impact = scenario_metrics['crop_production']
+    ecosystem_data = cached_ecosystem_simulation(bee_population_percentage, years_to_simulate, resilience_value)
+    
+    # Economic impact over the departments of the region and the crops of the crop type;
+    # regions without department data (Amazonia) are valued at the national
+    # level, and the cards say so
+    national_economy = selected_region != "Todas las regiones" and not REGION_DEPARTMENTS.get(selected_region)
+    economic_region = "Todas las regiones" if national_economy else selected_region
+    economic_scope = " (nacional)" if national_economy else ""
+    economic_impact = summarize_cube(
+        cached_economic_cube(bee_population_percentage, years_to_simulate, resilience_value),
+        region_departments(
+            cached_regional_simulation(bee_population_percentage, years_to_simulate, resilience_value),
+            economic_region
+        ),
+        CROP_TYPE_CROPS[cultivation_type]
+    )
     
     # Metrics display
     st.markdown("<div class='card'>", unsafe_allow_html=True)
@@ -258,18 +296,8 @@ with col2:
     metric_col1, metric_col2, metric_col3 = st.columns(3)
     with metric_col1:
         st.markdown("<div class='metric-card'>", unsafe_allow_html=True)
-        # Adjust impact based on selected crop type
-        crop_modifier = 1.0
-        if cultivation_type == "Café":
-            crop_modifier = 1.2  # Café tiene alta dependencia
-        elif cultivation_type == "Frutales":
-            crop_modifier = 1.15  # Frutales también alta dependencia
-        elif cultivation_type == "Hortalizas":
-            crop_modifier = 0.9  # Hortalizas dependencia variable
-        elif cultivation_type == "Cereales":
-            crop_modifier = 0.6  # Cereales menor dependencia
-            
-        adjusted_crop_impact = min(100, crop_production_impact * crop_modifier)
+        # Impact adjusted for the selected crop type
+        adjusted_crop_impact = scenario_metrics['adjusted_crop_production']
         
         st.metric(
             label="Producción Agrícola",
@@ -281,25 +309,9 @@ with col2:
     
     with metric_col2:
         st.markdown("<div class='metric-card'>", unsafe_allow_html=True)
-        # Adjust biodiversity impact based on selected region
-        region_modifier = 1.0
-        region_name = "Colombia"
-        
-        if selected_region == "Zona Cafetera":
-            region_modifier = 1.15
-            region_name = "Eje Cafetero"
-        elif selected_region == "Valle del Cauca":
-            region_modifier = 1.1
-            region_name = "Valle del Cauca"
-        elif selected_region == "Antioquia":
-            region_modifier = 1.2
-            region_name = "Antioquia"
-        elif selected_region == "Amazonia":
-            region_modifier = 1.3
-            region_name = "Amazonia"
-        
-        adjusted_biodiversity = biodiversity_impact * region_modifier
-        adjusted_biodiversity = min(100, adjusted_biodiversity)
+        # Biodiversity impact adjusted for the selected region
+        region_name = REGION_PARAMETERS[selected_region]['display_name']
+        adjusted_biodiversity = scenario_metrics['adjusted_biodiversity']
         
         st.metric(
             label=f"Biodiversidad en {region_name}",
@@ -311,17 +323,8 @@ with col2:
     
     with metric_col3:
         st.markdown("<div class='metric-card'>", unsafe_allow_html=True)
-        # Adjust species at risk based on region
-        base_species = 20000  # Especies estimadas en Colombia
-        if selected_region != "Todas las regiones":
-            if selected_region == "Amazonia":
-                base_species = 8000
-            elif selected_region in ["Antioquia", "Cauca"]:
-                base_species = 5000
-            else:
-                base_species = 3000
-                
-        species_at_risk = int(max(0, 100 - bee_population_percentage) * 0.2 * base_species / 100)
+        # Species at risk based on region
+        species_at_risk = int(scenario_metrics['species_at_risk'])
         
         st.metric(
             label="Especies en Riesgo",
@@ -337,48 +340,36 @@ with col2:
     
     with metric_col4:
         st.markdown("<div class='metric-card'>", unsafe_allow_html=True)
-        # Economic impact in millions of dollars
-        economic_base = 2800  # Millones de dólares como base
-        if selected_region != "Todas las regiones":
-            if selected_region in ["Zona Cafetera", "Antioquia"]:
-                economic_base = 950
-            elif selected_region == "Valle del Cauca":
-                economic_base = 850
-            else:
-                economic_base = 450
-        
-        economic_loss = economic_base * (max(0, 100 - bee_population_percentage) / 100)
+        # Economic impact in millions of dollars in the last simulated year
+        economic_loss = economic_impact['final_year_loss']
         
         st.metric(
-            label="Impacto Económico Estimado",
-            value=f"${economic_loss:.1f}M USD",
-            delta=f"-${economic_loss:.1f}M" if bee_population_percentage < 100 else "0",
-            delta_color="inverse"
+            label=f"Impacto Económico Estimado{economic_scope}",
+            value=f"${economic_loss:.1f}M USD/año",
+            delta=f"-${economic_loss:.1f}M" if economic_loss > 0 else "0",
+            delta_color="inverse",
+            help=(f"Pérdida anual al cabo de {years_to_simulate} años, valorada a precios de escasez. "
+                  f"Valor presente de las pérdidas del periodo: ${economic_impact['present_value']:,.0f}M USD")
         )
         st.markdown("</div>", unsafe_allow_html=True)
         
     with metric_col5:
         st.markdown("<div class='metric-card'>", unsafe_allow_html=True)
-        # Employment impact
-        jobs_base = 800000  # Empleos base impactados
-        if selected_region != "Todas las regiones":
-            if selected_region in ["Zona Cafetera", "Antioquia"]:
-                jobs_base = 250000
-            elif selected_region == "Valle del Cauca":
-                jobs_base = 200000
-            else:
-                jobs_base = 100000
-                
-        jobs_affected = int(jobs_base * (max(0, 100 - bee_population_percentage) / 100) * 0.7)
+        # Employment impact in the last simulated year
+        jobs_affected = int(economic_impact['final_year_jobs'])
         
         st.metric(
-            label="Empleos Potencialmente Afectados",
+            label=f"Empleos Potencialmente Afectados{economic_scope}",
             value=f"{jobs_affected:,}",
-            delta=f"-{jobs_affected:,}" if bee_population_percentage < 100 else "0",
+            delta=f"-{jobs_affected:,}" if jobs_affected > 0 else "0",
             delta_color="inverse"
         )
         st.markdown("</div>", unsafe_allow_html=True)
     
+    if national_economy:
+        st.info(f"No hay datos departamentales para {selected_region}; "
+                "el impacto económico y los empleos corresponden a toda Colombia.")
+    
     st.markdown("</div>", unsafe_allow_html=True)
     st.markdown("</div>", unsafe_allow_html=True)
     
@@ -396,7 +387,7 @@ with col2:
     
     if crop_viz_type == "Gráfico 2D":
         # Create plot of bee-crop relationship
-        fig_relationship = plot_bee_crop_relationship(bee_population_percentage)
+        fig_relationship = cached_bee_crop_relationship(bee_population_percentage)
         st.plotly_chart(fig_relationship, use_container_width=True)
         
         # Add explanation
@@ -409,7 +400,7 @@ with col2:
         """, unsafe_allow_html=True)
     else:
         # Create 3D animated plot
-        fig_relationship_3d = plot_bee_crop_relationship_3d(bee_population_percentage, years_to_simulate)
+        fig_relationship_3d = cached_bee_crop_relationship_3d(bee_population_percentage, years_to_simulate)
         st.plotly_chart(fig_relationship_3d, use_container_width=True)
         
         # Add explanation for 3D visualization
@@ -440,7 +431,7 @@ with col2:
     )
     
     if viz_type == "Gráfico 2D por Ecosistema":
-        fig_biodiversity = plot_biodiversity_impact(bee_population_percentage, resilience_value)
+        fig_biodiversity = cached_biodiversity_impact(bee_population_percentage, resilience_value)
         st.plotly_chart(fig_biodiversity, use_container_width=True)
         
         st.markdown("""
@@ -452,7 +443,7 @@ with col2:
         """, unsafe_allow_html=True)
     else:
         # Mostrar visualización 3D
-        fig_biodiversity_3d = plot_biodiversity_impact_3d(bee_population_percentage, resilience_value)
+        fig_biodiversity_3d = cached_biodiversity_impact_3d(bee_population_percentage, resilience_value)
         st.plotly_chart(fig_biodiversity_3d, use_container_width=True)
         
         st.markdown("""
@@ -484,7 +475,17 @@ with col2:
     st.markdown("<div class='card'>", unsafe_allow_html=True)
     st.markdown("<h2 class='sub-header'>Proyección a Futuro</h2>", unsafe_allow_html=True)
     
-    fig_forecast = plot_timeseries_forecast(ecosystem_data)
+    show_uncertainty = st.checkbox(
+        "Mostrar bandas de incertidumbre (Monte Carlo)",
+        value=False,
+        help="Muestrea los parámetros del modelo y muestra los percentiles P5-P95 de la proyección"
+    )
+    
+    if show_uncertainty:
+        monte_carlo = cached_uncertainty_bands(bee_population_percentage, years_to_simulate, resilience_value)
+        fig_forecast = plot_timeseries_forecast(ecosystem_data, monte_carlo['bands'])
+    else:
+        fig_forecast = cached_timeseries_forecast(bee_population_percentage, years_to_simulate, resilience_value)
     st.plotly_chart(fig_forecast, use_container_width=True)
     
     st.markdown("""
@@ -502,9 +503,41 @@ st.markdown("<h2 class='sub-header'>Mapa de Riesgo: Zonas vulnerables por pérdi
 
 map_col1, map_col2 = st.columns([3, 2])
 
+from streamlit_folium import st_folium
+
 with map_col1:
-    risk_map = create_risk_map(bee_population_percentage)
-    st_folium(risk_map, width=700, height=500)
+    # El mapa base se genera una sola vez y cada ejecución recibe su propia
+    # copia; solo la capa de riesgo de la vista actual cambia con el
+    # porcentaje de abejas. Los detalles de cada región se cargan al hacer clic
+    map_state = st.session_state.get("risk_map")
+    marker_features, markers_shown, markers_in_view = cached_risk_overlay(
+        bee_population_percentage, viewport_bounds(map_state)
+    )
+    marker_layer = risk_feature_layer(marker_features, popups=False)
+    map_center = (map_state or {}).get("center") or {}
+    with instrumentation.timed("main.st_folium"):
+        map_state = st_folium(
+            cached_risk_base_map(),
+            key="risk_map",
+            width=700,
+            height=500,
+            center=(map_center["lat"], map_center["lng"]) if map_center else MAP_CENTER,
+            zoom=(map_state or {}).get("zoom") or MAP_ZOOM,
+            feature_group_to_add=marker_layer,
+            returned_objects=["bounds", "center", "zoom", "last_object_clicked"],
+            render=False
+        )
+    if markers_shown < markers_in_view:
+        st.caption(f"Mostrando {markers_shown} de {markers_in_view} regiones en la vista; acerca el mapa para ver más.")
+    
+    clicked = (map_state or {}).get("last_object_clicked")
+    if clicked:
+        region_store = cached_region_store()
+        clicked_row = region_store.nearest(
+            clicked["lat"], clicked["lng"], max_distance=click_search_distance(map_state.get("zoom"))
+        )
+        if clicked_row is not None:
+            st.markdown(region_popup_html(region_store.select([clicked_row])[0]), unsafe_allow_html=True)
 
 with map_col2:
     st.markdown("""
@@ -612,19 +645,49 @@ with dashboard_container:
         st.markdown("<div class='dashboard-card'>", unsafe_allow_html=True)
         st.subheader("Datos por Región de Colombia")
         
-        # Tabla de datos por región
-        data = {
-            'Región': ["Zona Cafetera", "Valle del Cauca", "Antioquia", "Santander", "Cundinamarca"],
-            'Cultivos Dependientes': ["Café, Plátano, Aguacate", "Caña, Frutas", "Café, Aguacate", "Cacao, Frutas", "Flores, Fresas"],
-            'Riesgo': ["Alto", "Alto", "Alto", "Medio", "Medio"],
-            'Impacto Económico (M USD)': [950, 850, 900, 500, 600]
-        }
-        region_df = pd.DataFrame(data)
+        # Simulación de todos los departamentos con su propia tasa de declive de abejas,
+        # opcionalmente con dispersión de abejas entre departamentos vecinos
+        dispersal = st.checkbox(
+            "Dispersión de abejas entre departamentos vecinos",
+            value=False,
+            help=f"Las poblaciones de abejas se intercambian entre departamentos a menos de "
+                 f"{DEFAULT_DISPERSAL_RADIUS_KM:.0f} km"
+        )
+        regional_simulation = cached_regional_simulation(
+            bee_population_percentage, years_to_simulate, resilience_value,
+            dispersal_rate=DEFAULT_DISPERSAL_RATE if dispersal else 0.0
+        )
+        table_region = selected_region
+        if selected_region != "Todas las regiones" and not REGION_DEPARTMENTS.get(selected_region):
+            st.info(f"No hay datos departamentales para {selected_region}; se muestran todos los departamentos.")
+            table_region = "Todas las regiones"
+        
+        regional_aggregate = aggregate_region(regional_simulation, table_region).iloc[-1]
+        aggregate_cols = st.columns(3)
+        with aggregate_cols[0]:
+            st.metric(f"Abejas en {years_to_simulate} años", f"{regional_aggregate['bee_population']:.1f}%")
+        with aggregate_cols[1]:
+            st.metric("Biodiversidad", f"{regional_aggregate['biodiversity']:.1f}%")
+        with aggregate_cols[2]:
+            st.metric("Producción Agrícola", f"{regional_aggregate['crop_production']:.1f}%")
+        
+        # Tabla de datos por departamento al final del horizonte simulado
+        region_df = department_summary(regional_simulation, table_region)[
+            ['department', 'crops_value', 'bee_population', 'biodiversity', 'crop_production']
+        ].rename(columns={
+            'department': 'Departamento',
+            'crops_value': 'Valor Cultivos Dependientes',
+            'bee_population': 'Abejas (%)',
+            'biodiversity': 'Biodiversidad (%)',
+            'crop_production': 'Producción Agrícola (%)'
+        }).round(1)
         st.dataframe(region_df, use_container_width=True)
         
         st.markdown("""
-        <p>La tabla muestra las regiones más importantes para la polinización en Colombia y 
-        los cultivos que dependen de polinizadores en cada una.</p>
+        <p>Cada departamento se simula con su propia tasa anual de declive de abejas a partir del nivel
+        seleccionado. Con la dispersión activada, las abejas se desplazan entre departamentos vecinos, de
+        las poblaciones más altas a las más bajas. La tabla muestra el estado al final del horizonte simulado
+        y las métricas superiores son el agregado de la región seleccionada.</p>
         """, unsafe_allow_html=True)
         st.markdown("</div>", unsafe_allow_html=True)
         
@@ -658,3 +721,9 @@ st.markdown("""
 Desarrollado con 🐝 para la conservación de polinizadores en Colombia | 2025
 </div>
 """, unsafe_allow_html=True)
+
+if debug_mode:
+    try:
+        show_instrumentation_panel(instrumentation.snapshot(), time.perf_counter() - rerun_start)
+    finally:
+        instrumentation.disable()
@@ -1,9 +1,19 @@
 import streamlit as st
-import pandas as pd
+import numpy as np
 import folium
-from folium.plugins import HeatMap, MarkerCluster
+from folium.plugins import HeatMap
 from streamlit_folium import st_folium
-from data.regions import get_risk_regions
+from cache import cached_region_store
+from visualizations import (
+    MAP_CENTER,
+    MAP_ZOOM,
+    click_search_distance,
+    dependency_circle_radius,
+    region_popup_html,
+    risk_marker_layer,
+    select_viewport_regions,
+    viewport_bounds
+)
 
 st.set_page_config(
     page_title="Mapa Detallado - Impacto de Abejas en Colombia",
@@ -96,63 +106,36 @@ with control_col3:
 # Crear el mapa
 st.markdown("<div class='map-container'>", unsafe_allow_html=True)
 
-# Obtener datos de regiones
-regions = get_risk_regions()
+# Obtener datos de regiones (indexados por riesgo, dependencia y ubicación)
+region_store = cached_region_store()
 
-# Filtrar datos según selecciones
-filtered_regions = [
-    region for region in regions
-    if region["risk"] in risk_filter and region["dependency"] >= dependency_threshold
-]
+# Estado de la vista del mapa (límites, centro y zoom) devuelto por st_folium
+map_state = st.session_state.get("detailed_map")
+map_center = (map_state or {}).get("center") or {}
 
 # Crear mapa base
-m = folium.Map(location=[4.5709, -74.2973], zoom_start=6, tiles='CartoDB dark_matter')
+m = folium.Map(location=MAP_CENTER, zoom_start=MAP_ZOOM, tiles='CartoDB dark_matter')
+marker_layer = None
 
 # Agregar visualización según selección
-if map_type == "Marcadores":
-    for region in filtered_regions:
-        # Determinar color basado en riesgo
-        if region["risk"] == "Alto":
-            color = 'red'
-        elif region["risk"] == "Medio":
-            color = 'orange'
-        else:
-            color = 'green'
-            
-        # Crear popup con información
-        popup_content = f"""
-        <div style="width: 250px">
-            <h4>{region['name']}</h4>
-            <p><strong>Nivel de riesgo:</strong> {region['risk']}</p>
-            <p><strong>Cultivos principales:</strong> {region['crops']}</p>
-            <p><strong>Dependencia de polinizadores:</strong> {region['dependency']}%</p>
-            <p><strong>Descripción:</strong> {region['description']}</p>
-        </div>
-        """
-        tooltip = f"{region['name']} - Riesgo: {region['risk']}"
-        
-        # Añadir marcador
-        folium.Marker(
-            location=[region['lat'], region['lon']],
-            popup=folium.Popup(popup_content, max_width=300),
-            tooltip=tooltip,
-            icon=folium.Icon(color=color, icon='leaf', prefix='fa')
-        ).add_to(m)
-        
-        # Círculo con tamaño proporcional al nivel de dependencia
-        folium.Circle(
-            radius=region['dependency'] * 500,
-            location=[region['lat'], region['lon']],
-            color=color,
-            fill=True,
-            fill_opacity=0.2,
-            opacity=0.6,
-            weight=1
-        ).add_to(m)
+if map_type in ("Marcadores", "Clusters"):
+    # Solo las regiones filtradas dentro de la vista actual, con detalles al hacer clic
+    visible_regions, regions_in_view = select_viewport_regions(
+        region_store, viewport_bounds(map_state), risk=risk_filter, min_dependency=dependency_threshold
+    )
+    marker_layer = risk_marker_layer(
+        visible_regions,
+        radius=dependency_circle_radius,  # Proporcional al nivel de dependencia
+        popups=False,
+        clustered=(map_type == "Clusters")
+    )
 
 elif map_type == "Mapa de calor":
-    # Datos para el mapa de calor
-    heat_data = [[region['lat'], region['lon'], region['dependency']] for region in filtered_regions]
+    # Datos para el mapa de calor, leídos directamente de las columnas filtradas
+    rows = region_store.query(risk=risk_filter, min_dependency=dependency_threshold)
+    heat_data = np.column_stack([
+        region_store.lat[rows], region_store.lon[rows], region_store.dependency[rows]
+    ]).astype(float).tolist()
     
     # Añadir mapa de calor
     HeatMap(
@@ -168,55 +151,44 @@ elif map_type == "Mapa de calor":
         blur=10
     ).add_to(m)
 
-elif map_type == "Clusters":
-    # Crear clúster de marcadores
-    marker_cluster = MarkerCluster().add_to(m)
+# Mostrar el mapa
+map_state = st_folium(
+    m,
+    key="detailed_map",
+    width=1200,
+    height=600,
+    center=(map_center["lat"], map_center["lng"]) if map_center else MAP_CENTER,
+    zoom=(map_state or {}).get("zoom") or MAP_ZOOM,
+    feature_group_to_add=marker_layer,
+    returned_objects=["bounds", "center", "zoom", "last_object_clicked"]
+)
+
+if marker_layer is not None:
+    if len(visible_regions) < regions_in_view:
+        st.caption(f"Mostrando {len(visible_regions)} de {regions_in_view} regiones en la vista; acerca el mapa para ver más.")
     
-    for region in filtered_regions:
-        # Determinar color basado en riesgo
-        if region["risk"] == "Alto":
-            color = 'red'
-        elif region["risk"] == "Medio":
-            color = 'orange'
-        else:
-            color = 'green'
-            
-        # Crear popup con información
-        popup_content = f"""
-        <div style="width: 250px">
-            <h4>{region['name']}</h4>
-            <p><strong>Nivel de riesgo:</strong> {region['risk']}</p>
-            <p><strong>Cultivos principales:</strong> {region['crops']}</p>
-            <p><strong>Dependencia de polinizadores:</strong> {region['dependency']}%</p>
-        </div>
-        """
-        
-        # Añadir marcador al clúster
-        folium.Marker(
-            location=[region['lat'], region['lon']],
-            popup=folium.Popup(popup_content, max_width=300),
-            tooltip=region['name'],
-            icon=folium.Icon(color=color, icon='leaf', prefix='fa')
-        ).add_to(marker_cluster)
+    # Detalles de la región seleccionada, cargados al hacer clic
+    clicked = (map_state or {}).get("last_object_clicked")
+    if clicked:
+        clicked_row = region_store.nearest(
+            clicked["lat"], clicked["lng"], max_distance=click_search_distance(map_state.get("zoom"))
+        )
+        if clicked_row is not None:
+            st.markdown(region_popup_html(region_store.select([clicked_row])[0]), unsafe_allow_html=True)
 
-# Mostrar el mapa
-st_folium(m, width=1200, height=600)
 st.markdown("</div>", unsafe_allow_html=True)
 
 # Análisis adicional
 st.markdown("<div class='card'>", unsafe_allow_html=True)
 st.markdown("<h2 class='sub-header'>Análisis Regional</h2>", unsafe_allow_html=True)
 
-# Crear dataframe para análisis
-region_df = pd.DataFrame([
-    {
-        'Región': region['name'],
-        'Riesgo': region['risk'],
-        'Dependencia (%)': region['dependency'],
-        'Cultivos': region['crops']
-    }
-    for region in regions
-])
+# Crear dataframe para análisis (vista de solo lectura de la tabla columnar)
+region_df = region_store.table.frame()[['name', 'risk', 'dependency', 'crops']].rename(columns={
+    'name': 'Región',
+    'risk': 'Riesgo',
+    'dependency': 'Dependencia (%)',
+    'crops': 'Cultivos'
+})
 
 # Mostrar estadísticas
 analysis_col1, analysis_col2 = st.columns(2)
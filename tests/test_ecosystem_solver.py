@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+pytest.importorskip('scipy')
+pytest.importorskip('pandas')
+
+from core.models import create_ecosystem_simulation
+
+COLUMNS = ['biodiversity', 'crop_production', 'wild_plants', 'bee_population']
+TOLERANCE = 1e-4  # Percentage points, as in benchmarks/bench_ecosystem_solver.py
+
+
+@pytest.mark.parametrize('years', [1, 10, 50])
+def test_analytic_solver_matches_odeint(years):
+    for bee_percentage in range(10, 101, 15):
+        for resilience in (0.2, 0.6, 1.0):
+            analytic = create_ecosystem_simulation(bee_percentage, years, resilience, solver='analytic')
+            numeric = create_ecosystem_simulation(bee_percentage, years, resilience, solver='odeint')
+            np.testing.assert_array_equal(analytic['time'], numeric['time'])
+            assert np.allclose(analytic[COLUMNS].values, numeric[COLUMNS].values, rtol=0, atol=TOLERANCE), \
+                (bee_percentage, resilience, years)
+
+
+def test_auto_uses_the_analytic_solver_for_a_constant_population():
+    expected = create_ecosystem_simulation(40, 10, 0.6, solver='analytic')
+    assert create_ecosystem_simulation(40, 10, 0.6).equals(expected)
+    constant = np.full(120, 40.0)
+    assert create_ecosystem_simulation(40, 10, 0.6, bee_trajectory=constant).equals(expected)
+
+
+def test_auto_integrates_a_varying_population():
+    trajectory = np.linspace(80, 20, 120)
+    expected = create_ecosystem_simulation(80, 10, 0.6, bee_trajectory=trajectory, solver='odeint')
+    result = create_ecosystem_simulation(80, 10, 0.6, bee_trajectory=trajectory)
+    assert result.equals(expected)
+    np.testing.assert_allclose(result['bee_population'], trajectory)
+
+
+def test_analytic_solver_rejects_a_varying_population():
+    with pytest.raises(ValueError):
+        create_ecosystem_simulation(80, 10, 0.6, bee_trajectory=np.linspace(80, 20, 120), solver='analytic')
+
+
+def test_unknown_solver_is_rejected():
+    with pytest.raises(ValueError):
+        create_ecosystem_simulation(40, 10, 0.6, solver='rk4')
@@ -0,0 +1,25 @@
+from core import instrumentation
+
+
+def _samples(text):
+    return [line for line in text.splitlines() if not line.startswith('#')]
+
+
+def test_prometheus_exports_the_rerun_records_as_gauges():
+    @instrumentation.instrumented('tests.work')
+    def work():
+        return sum(range(100))
+
+    instrumentation.enable()
+    try:
+        for rerun_calls in (3, 1):
+            instrumentation.reset()
+            for _ in range(rerun_calls):
+                work()
+            text = instrumentation.to_prometheus(instrumentation.snapshot(), page='main')
+
+            types = [line.split()[-1] for line in text.splitlines() if line.startswith('# TYPE')]
+            assert types == ['gauge'] * len(instrumentation.PROMETHEUS_METRICS)
+            assert f'abejas_rerun_calls{{page="main",function="tests.work"}} {rerun_calls}' in _samples(text)
+    finally:
+        instrumentation.disable()
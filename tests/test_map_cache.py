@@ -0,0 +1,55 @@
+import copy
+
+import pytest
+
+pytest.importorskip('folium')
+streamlit_folium = pytest.importorskip('streamlit_folium')
+
+from cache import _rendered_risk_base_map, cached_risk_base_map, cached_risk_overlay
+from visualizations import risk_feature_layer
+
+# Viewports of a few pans and zooms around the default view
+VIEWPORTS = [None, (-4.2, -79.0, 12.5, -66.9), (2.0, -77.0, 8.0, -72.0), (4.4, -74.3, 4.8, -73.9)]
+
+
+def _figure_state(base_map):
+    """Children of the map and of every section of its root Figure (rendering would add some)."""
+    root = base_map.get_root()
+    return (
+        list(base_map._children),
+        {section: list(getattr(root, section)._children) for section in ('header', 'html', 'script')}
+    )
+
+
+def _simulated_rerun(bee_percentage, bounds):
+    """The st_folium call of main.py for one slider value and viewport."""
+    features, _, _ = cached_risk_overlay(bee_percentage, bounds)
+    streamlit_folium.st_folium(
+        cached_risk_base_map(),
+        key="risk_map",
+        feature_group_to_add=risk_feature_layer(features, popups=False),
+        returned_objects=["bounds", "center", "zoom", "last_object_clicked"],
+        render=False
+    )
+
+
+def test_st_folium_does_not_change_the_cached_base_map():
+    base_map = _rendered_risk_base_map()
+    before = _figure_state(base_map)
+
+    for bee_percentage in (10, 60, 100):
+        for bounds in VIEWPORTS:
+            _simulated_rerun(bee_percentage, bounds)
+
+    assert _rendered_risk_base_map() is base_map
+    assert _figure_state(base_map) == before
+
+
+def test_st_folium_does_not_change_the_cached_overlay_features():
+    features = cached_risk_overlay(60, VIEWPORTS[1])[0]
+    before = copy.deepcopy(features)
+
+    _simulated_rerun(60, VIEWPORTS[1])
+
+    assert cached_risk_overlay(60, VIEWPORTS[1])[0] is features
+    assert features == before
@@ -0,0 +1,90 @@
+import numpy as np
+import pytest
+
+from core.models import calculate_biodiversity_impact, calculate_crop_production
+
+# Bee levels beyond 0-100 and steep sigmoids reach the saturated (100) and
+# underflowing (0) ends of the biodiversity curve
+BEE_GRID = [float(value) for value in np.linspace(-500, 600, 441)] + [0, 20, 50, 80, 100]
+RESILIENCE_GRID = [0.0, 0.2, 0.35, 0.6, 1.0]
+STEEPNESS_GRID = [5, 50, 2000]
+
+
+def _baseline_biodiversity_impact(bee_percentage, ecosystem_resilience, k=5):
+    """calculate_biodiversity_impact before vectorization, with the steepness as a parameter."""
+    bee_norm = bee_percentage / 100
+    mid_point = 0.5
+    adjusted_bee = bee_norm + (ecosystem_resilience * 0.3)
+    biodiversity_factor = 1 / (1 + np.exp(-k * (adjusted_bee - mid_point)))
+    biodiversity_index = biodiversity_factor * 100
+    return min(biodiversity_index, 100)
+
+
+def _baseline_crop_production(bee_percentage):
+    """calculate_crop_production before vectorization."""
+    bee_dependent_percentage = 0.35
+    bee_norm = bee_percentage / 100
+    if bee_norm >= 0.8:
+        bee_crop_factor = 1.0
+    elif bee_norm >= 0.5:
+        bee_crop_factor = 0.8 + ((bee_norm - 0.5) / 0.3) * 0.2
+    elif bee_norm >= 0.2:
+        bee_crop_factor = 0.4 + ((bee_norm - 0.2) / 0.3) * 0.4
+    else:
+        bee_crop_factor = bee_norm / 0.2 * 0.4
+    crop_production_factor = (bee_dependent_percentage * bee_crop_factor) + \
+                             ((1 - bee_dependent_percentage) * 1.0)
+    return crop_production_factor * 100
+
+
+@pytest.mark.parametrize('steepness', STEEPNESS_GRID)
+def test_scalar_biodiversity_matches_baseline_exactly(steepness):
+    with np.errstate(over='ignore'):
+        for resilience in RESILIENCE_GRID:
+            for bee in BEE_GRID:
+                expected = _baseline_biodiversity_impact(bee, resilience, steepness)
+                result = calculate_biodiversity_impact(bee, resilience, steepness)
+                assert isinstance(result, float)
+                assert result == expected, (bee, resilience, steepness)
+
+
+def test_scalar_biodiversity_grid_reaches_both_ends():
+    with np.errstate(over='ignore'):
+        values = {calculate_biodiversity_impact(bee, 1.0, 2000) for bee in BEE_GRID}
+    assert 100.0 in values and 0.0 in values
+
+
+@pytest.mark.parametrize('steepness', STEEPNESS_GRID)
+def test_array_biodiversity_matches_scalar_path(steepness):
+    bee = np.array(BEE_GRID)
+    resilience = np.array(RESILIENCE_GRID)[:, np.newaxis]
+    with np.errstate(over='ignore'):
+        grid = calculate_biodiversity_impact(bee, resilience, steepness)
+        expected = [[calculate_biodiversity_impact(b, r, steepness) for b in BEE_GRID] for r in RESILIENCE_GRID]
+    np.testing.assert_array_equal(grid, expected)
+
+
+def test_scalar_crop_production_matches_baseline_exactly():
+    for bee in BEE_GRID:
+        assert calculate_crop_production(bee) == _baseline_crop_production(bee), bee
+
+
+def test_array_crop_production_matches_baseline_exactly():
+    np.testing.assert_array_equal(
+        calculate_crop_production(np.array(BEE_GRID)),
+        [_baseline_crop_production(bee) for bee in BEE_GRID]
+    )
+
+
+@pytest.mark.parametrize('bee', [55, 55.0, np.float64(55.0), np.int64(55), 15, 90.0])
+def test_scalar_crop_production_returns_a_float(bee):
+    result = calculate_crop_production(bee)
+    assert type(result) is float
+    assert result == _baseline_crop_production(float(bee))
+
+
+def test_scalar_crop_production_matches_the_array_path_for_any_share():
+    for share in (0, 1, 0.2, 0.9):
+        for bee in BEE_GRID:
+            assert calculate_crop_production(bee, share) == calculate_crop_production(np.array(bee), share), \
+                (bee, share)
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+pd = pytest.importorskip('pandas')
+pytest.importorskip('scipy')
+
+from core.batch import normalize_scenarios, run_batch, run_scenarios
+from core.models import create_ecosystem_simulation, simulate_ensemble
+from core.parallel import run_parallel_simulations
+
+COLUMNS = ['biodiversity', 'crop_production', 'wild_plants', 'bee_population']
+RNG = np.random.default_rng(0)
+BEE = RNG.uniform(10, 100, 200)
+RESILIENCE = RNG.uniform(0.2, 1.0, 200)
+YEARS = RNG.integers(1, 20, 200)
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+@pytest.mark.parametrize('years', [10, YEARS], ids=['shared years', 'per-scenario years'])
+def test_parallel_simulations_match_the_ensemble(workers, years):
+    result = run_parallel_simulations(BEE, RESILIENCE, years, workers=workers, chunk_size=30)
+    expected = simulate_ensemble(BEE, RESILIENCE, years)
+    np.testing.assert_array_equal(result['time'], expected['time'])
+    np.testing.assert_array_equal(result['states'], expected['states'])
+
+
+def test_parallel_simulations_integrate_bee_trajectories():
+    trajectories = np.linspace(80, 20, 120) * np.array([[1.0], [0.8], [0.6]])
+    result = run_parallel_simulations([80, 64, 48], 0.6, 10, bee_trajectories=trajectories,
+                                      workers=2, chunk_size=2)
+    for states, trajectory in zip(result['states'], trajectories):
+        expected = create_ecosystem_simulation(trajectory[0], 10, 0.6, bee_trajectory=trajectory)
+        np.testing.assert_allclose(states.T, expected[COLUMNS].values)
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_batch_runs_through_the_worker_pool(tmp_path, workers):
+    scenarios = pd.DataFrame({'bee_percentage': BEE, 'resilience': RESILIENCE, 'years': YEARS})
+    scenarios.to_csv(tmp_path / 'scenarios.csv', index=False)
+
+    count = run_batch(str(tmp_path / 'scenarios.csv'), str(tmp_path / 'results.csv'),
+                      workers=workers, chunk_size=70)
+
+    assert count == len(scenarios)
+    expected = run_scenarios(normalize_scenarios(scenarios))
+    result = pd.read_csv(tmp_path / 'results.csv')
+    np.testing.assert_allclose(
+        result.select_dtypes('number').values, expected.select_dtypes('number').values, rtol=1e-12
+    )
@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+
+pytest.importorskip('scipy')
+pytest.importorskip('pandas')
+
+from core.data_module import get_initial_data
+from core.spatial import dispersal_matrix, simulate_metapopulation, simulate_regions
+
+DEPARTMENTS = get_initial_data()['colombia']
+LAT = DEPARTMENTS['lat'].values
+LON = DEPARTMENTS['lon'].values
+RADIUS_KM = 150.0
+
+
+def _great_circle_km(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * 6371.0 * np.arcsin(np.sqrt(a))
+
+
+def test_dispersal_matrix_couples_only_neighbors():
+    weights = dispersal_matrix(LAT, LON, RADIUS_KM).toarray()
+    distance = _great_circle_km(LAT[:, np.newaxis], LON[:, np.newaxis], LAT, LON)
+
+    np.testing.assert_array_equal(weights, weights.T)
+    np.testing.assert_array_equal(np.diag(weights), 0)
+    assert np.all(weights[distance > RADIUS_KM] == 0)
+    off_diagonal = ~np.eye(len(LAT), dtype=bool)
+    np.testing.assert_allclose(
+        weights[(distance <= RADIUS_KM) & off_diagonal],
+        np.exp(-distance[(distance <= RADIUS_KM) & off_diagonal] / (RADIUS_KM / 2)),
+        rtol=1e-9
+    )
+
+
+def test_dispersal_laplacian_rows_sum_to_zero():
+    weights = dispersal_matrix(LAT, LON, RADIUS_KM)
+    assert weights.nnz > 0  # The Zona Cafetera capitals are within the radius
+    laplacian = weights.toarray() - np.diag(np.asarray(weights.sum(axis=1)).ravel())
+    np.testing.assert_allclose(laplacian.sum(axis=1), 0, atol=1e-12)
+
+
+def test_dispersal_conserves_bees_without_mortality():
+    initial = np.linspace(20, 90, len(LAT))
+    result = simulate_metapopulation(initial, 20, 0.6, LAT, LON, np.zeros(len(LAT)), dispersal_rate=0.5)
+    bees = result['states'][:, 3]
+
+    np.testing.assert_allclose(bees.sum(axis=0), initial.sum(), rtol=1e-5)
+    # Neighbors converge toward each other, isolated departments do not move
+    assert bees[:, -1].std() < initial.std()
+    isolated = np.asarray(result['dispersal'].sum(axis=1)).ravel() == 0
+    np.testing.assert_allclose(bees[isolated, -1], initial[isolated], rtol=1e-6)
+
+
+def test_metapopulation_without_dispersal_matches_independent_departments():
+    independent = simulate_regions(60, 10, 0.6)
+    result = simulate_metapopulation(
+        60, 10, 0.6, LAT, LON, DEPARTMENTS['bee_decline_rate'].values, dispersal_rate=0.0
+    )
+    np.testing.assert_array_equal(result['time'], independent['time'])
+    np.testing.assert_allclose(result['states'], independent['states'], rtol=0, atol=1e-3)
+
+
+def test_regional_simulation_with_dispersal():
+    independent = simulate_regions(60, 10, 0.6)
+    dispersed = simulate_regions(60, 10, 0.6, dispersal_rate=0.5)
+
+    for key in ('variables', 'departments', 'time'):
+        np.testing.assert_array_equal(dispersed[key], independent[key])
+    np.testing.assert_array_equal(dispersed['crops_value'], independent['crops_value'])
+    assert dispersed['states'].shape == independent['states'].shape
+    # Exchanging bees narrows the spread of the department declines
+    assert dispersed['states'][:, 3, -1].std() < independent['states'][:, 3, -1].std()
@@ -0,0 +1,24 @@
+import pytest
+
+pytest.importorskip('pandas')
+
+from core.uncertainty import iter_monte_carlo, run_monte_carlo
+
+
+@pytest.mark.parametrize('report_every, expected', [
+    (1, [1000, 2000, 3000, 4000, 4500]),
+    (2, [2000, 4000, 4500]),
+    (None, [4500])
+])
+def test_bands_are_yielded_every_report_interval_and_at_the_end(report_every, expected):
+    results = iter_monte_carlo(60, 5, 0.6, n_draws=4500, batch_size=1000, random_state=0,
+                               report_every=report_every)
+    assert [result['draws'] for result in results] == expected
+
+
+def test_run_monte_carlo_returns_the_final_bands():
+    *_, streamed = iter_monte_carlo(60, 5, 0.6, n_draws=4500, batch_size=1000, random_state=0)
+    result = run_monte_carlo(60, 5, 0.6, n_draws=4500, batch_size=1000, random_state=0)
+    assert result['draws'] == 4500
+    assert result['bands'].equals(streamed['bands'])
+    assert result['indices'].equals(streamed['indices'])
@@ -1,5 +1,5 @@
-import streamlit as st
-
+# streamlit is imported by the functions drawing UI elements only, so the
+# formatting helpers can be used outside the app
 def get_emoji(emoji_type):
     """
     Return an emoji based on the requested type.
@@ -41,6 +41,8 @@ def add_vertical_space(num_lines=1):
     num_lines : int
         Number of lines of vertical space to add
     """
+    import streamlit as st
+    
     for _ in range(num_lines):
         st.markdown("<br>", unsafe_allow_html=True)
 
@@ -135,3 +137,41 @@ def get_quick_facts():
     ]
     
     return facts
+
+def show_instrumentation_panel(records, total_seconds=None):
+    """
+    Show the instrumentation records of the current rerun in a collapsed
+    sidebar panel, with downloads for JSON lines and Prometheus text.
+    
+    Parameters:
+    -----------
+    records : list of dict
+        Result of core.instrumentation.snapshot()
+    total_seconds : float, optional
+        Wall time of the whole script run
+    """
+    import pandas as pd
+    import streamlit as st
+    from core.instrumentation import to_json_lines, to_prometheus
+    
+    with st.sidebar.expander("Depuración: tiempos de ejecución", expanded=False):
+        if total_seconds is not None:
+            st.caption(f"Ejecución completa del script: {total_seconds * 1e3:.0f} ms")
+        if not records:
+            st.caption("Sin llamadas instrumentadas en esta ejecución (resultados en caché).")
+            return
+        
+        table = pd.DataFrame(records)
+        st.dataframe(pd.DataFrame({
+            'Función': table['name'],
+            'Llamadas': table['calls'],
+            'Tiempo total (ms)': (table['seconds'] * 1e3).round(2),
+            'Máximo (ms)': (table['max_seconds'] * 1e3).round(2),
+            'Memoria retenida (kB)': (table['allocated_bytes'] / 1024).round(1),
+            'Pico de memoria (kB)': (table['peak_bytes'] / 1024).round(1)
+        }), hide_index=True)
+        
+        st.download_button("Descargar JSON lines", to_json_lines(records), file_name="instrumentacion.jsonl",
+                           mime="application/x-ndjson")
+        st.download_button("Descargar Prometheus", to_prometheus(records), file_name="instrumentacion.prom",
+                           mime="text/plain")
@@ -1,64 +1,102 @@
+import base64
 import plotly.graph_objects as go
-import plotly.express as px
-import pandas as pd
 import numpy as np
-import folium
-from folium.plugins import HeatMap
-from models import calculate_crop_production, calculate_biodiversity_impact
+# folium is imported by the map builders only, so that pages drawing plotly
+# figures do not load it at import time
+from core.models import calculate_crop_production, calculate_biodiversity_impact
+from core.surfaces import biodiversity_surface, crop_production_surface, crop_time_factor
+from cache import memoized
+from core.instrumentation import instrumented
 
-def plot_bee_crop_relationship_3d(current_bee_percentage, years=10):
+def _figure_from_template(template, traces, frames=None):
     """
-    Create a 3D interactive visualization showing the relationship between
-    bee population, time, and crop production.
+    Assemble a figure from a cached static template and its dynamic traces.
+    
+    The static traces and layout are built (and validated) once per template;
+    the per-call work is limited to the dynamic traces, which are appended
+    after the static ones without revalidating the whole figure. This saves
+    construction time only: the figure and its JSON are the same as when
+    built from scratch.
     
     Parameters:
     -----------
-    current_bee_percentage : float
-        Current bee population percentage to highlight
-    years : int
-        Number of years to simulate
+    template : dict
+        Figure dictionary of the static part, as returned by Figure.to_dict()
+    traces : list of dict
+        Dynamic traces, each with a 'type' key
+    frames : list of dict, optional
+        Animation frames
         
     Returns:
     --------
     plotly.graph_objects.Figure
-        Interactive 3D plot
+        Figure with the template traces followed by `traces`
     """
-    # Generate bee population range
-    bee_range = np.linspace(0, 100, 40)
-    
-    # Generate time range
-    time_range = np.linspace(0, years, 20)
-    
-    # Create meshgrid
-    bee_grid, time_grid = np.meshgrid(bee_range, time_range)
+    figure = {
+        'data': template['data'] + traces,
+        'layout': template['layout']
+    }
+    if frames is not None:
+        figure['frames'] = frames
+    return go.Figure(figure, _validate=False)
+
+def _typed_array(values, dtype):
+    """
+    Encode an array as a plotly.js typed-array spec (base64 binary data) of
+    the given dtype. Plotly already encodes float64 numpy arrays this way;
+    the explicit dtype lets the surface values be sent as float32.
+    """
+    array = np.ascontiguousarray(values, dtype=np.dtype(dtype).newbyteorder('<'))
+    spec = {
+        'dtype': array.dtype.str[1:],
+        'bdata': base64.b64encode(array.tobytes()).decode('ascii')
+    }
+    if array.ndim > 1:
+        spec['shape'] = ', '.join(str(size) for size in array.shape)
+    return spec
+
+def _encode_surface(trace, x, y, z):
+    """
+    Replace the coordinates of a surface trace dictionary with compact
+    typed arrays: separable 1-D x/y axes in float64 and float32 z values.
     
-    # Initialize crop production grid
-    crop_grid = np.zeros_like(bee_grid)
+    Parameters:
+    -----------
+    trace : dict
+        Surface trace dictionary, modified in place
+    x : np.ndarray
+        1-D axis matching the columns of `z`
+    y : np.ndarray
+        1-D axis matching the rows of `z`
+    z : np.ndarray
+        2-D surface values
+    """
+    trace['x'] = _typed_array(x, np.float64)
+    trace['y'] = _typed_array(y, np.float64)
+    trace['z'] = _typed_array(z, np.float32)
+
+@memoized(maxsize=64)
+@instrumented()
+def _bee_crop_relationship_3d_template(years=10, resolution=(40, 20)):
+    """
+    Static part of plot_bee_crop_relationship_3d: the crop surface, the
+    layout and the animation controls, which only depend on the horizon
+    and the resolution.
     
-    # Calculate crop production for each point with time decay
-    for i in range(bee_grid.shape[0]):
-        for j in range(bee_grid.shape[1]):
-            bee_val = bee_grid[i, j]
-            time_val = time_grid[i, j]
-            
-            # Base crop production based on current bee population
-            base_crop = calculate_crop_production(bee_val)
-            
-            # Apply time effect - long-term decline if bee population is low
-            time_factor = 1.0
-            if bee_val < 50:
-                # Calculate decline over time
-                time_factor = max(0.5, 1.0 - (time_val / years) * (0.1 * (50 - bee_val) / 50))
-            
-            crop_grid[i, j] = base_crop * time_factor
+    Returns:
+    --------
+    dict
+        Figure dictionary without the current-position marker and frames
+    """
+    bee_range, time_range, crop_grid = crop_production_surface(years, resolution)
     
     # Create 3D surface plot
     fig = go.Figure()
     
     # Add surface
     fig.add_trace(go.Surface(
-        x=bee_grid,
-        y=time_grid,
+        x=bee_range,
+        y=time_range,
         z=crop_grid,
         colorscale='viridis',
         colorbar=dict(
@@ -79,20 +117,6 @@ def plot_bee_crop_relationship_3d(current_bee_percentage, years=10):
         }
     ))
     
-    # Add marker for current position
-    fig.add_trace(go.Scatter3d(
-        x=[current_bee_percentage], 
-        y=[0], 
-        z=[calculate_crop_production(current_bee_percentage)],
-        mode='markers',
-        marker=dict(
-            size=10,
-            color='red',
-            symbol='circle'
-        ),
-        name='Punto Actual'
-    ))
-    
     # Update layout
     fig.update_layout(
         title='Proyección 3D: Relación entre Población de Abejas, Tiempo y Producción Agrícola',
@@ -112,30 +136,7 @@ def plot_bee_crop_relationship_3d(current_bee_percentage, years=10):
         height=600
     )
     
-    # Add animation effect
-    frames = []
-    for year in np.linspace(0, years, 10):
-        frame = go.Frame(
-            data=[
-                go.Scatter3d(
-                    x=[current_bee_percentage], 
-                    y=[year], 
-                    z=[calculate_crop_production(current_bee_percentage) * 
-                       (1.0 if current_bee_percentage >= 50 else 
-                        max(0.5, 1.0 - (year / years) * (0.1 * (50 - current_bee_percentage) / 50)))],
-                    mode='markers',
-                    marker=dict(
-                        size=10,
-                        color='red',
-                        symbol='circle'
-                    )
-                )
-            ],
-            name=f'Year {year:.1f}'
-        )
-        frames.append(frame)
-    
-    fig.frames = frames
+    frame_years = np.linspace(0, years, 10)
     
     # Add animation buttons
     def frame_args(duration):
@@ -151,11 +152,11 @@ def plot_bee_crop_relationship_3d(current_bee_percentage, years=10):
             "active": 0,
             "steps": [
                 {
-                    "args": [[f.name], frame_args(300)],
+                    "args": [[f'Year {year:.1f}'], frame_args(300)],
                     "label": f"{year:.1f}",
                     "method": "animate",
                 }
-                for year, f in zip(np.linspace(0, years, 10), frames)
+                for year in frame_years
             ],
             "x": 0.1,
             "y": 0,
@@ -187,26 +188,78 @@ def plot_bee_crop_relationship_3d(current_bee_percentage, years=10):
         sliders=sliders
     )
     
-    return fig
+    template = fig.to_dict()
+    _encode_surface(template['data'][0], bee_range, time_range, crop_grid)
+    return template
 
-def plot_bee_crop_relationship(current_bee_percentage):
+@instrumented()
+def plot_bee_crop_relationship_3d(current_bee_percentage, years=10, resolution=(40, 20)):
     """
-    Create an interactive plot showing the relationship between
-    bee population and crop production.
+    Create a 3D interactive visualization showing the relationship between
+    bee population, time, and crop production.
     
     Parameters:
     -----------
     current_bee_percentage : float
         Current bee population percentage to highlight
+    years : int
+        Number of years to simulate
+    resolution : tuple of int
+        Number of surface points along the bee population and time axes,
+        e.g. (400, 200) for publication exports
         
     Returns:
     --------
     plotly.graph_objects.Figure
-        Interactive plot
+        Interactive 3D plot
+    """
+    template = _bee_crop_relationship_3d_template(years, tuple(resolution))
+    
+    # Marker trajectory for the current position over the animation frames
+    frame_years = np.linspace(0, years, 10)
+    current_crop = calculate_crop_production(current_bee_percentage)
+    frame_crops = current_crop * crop_time_factor(current_bee_percentage, frame_years, years)
+    
+    marker = dict(size=10, color='red', symbol='circle')
+    
+    # Marker for current position
+    current_point = dict(
+        type='scatter3d',
+        x=[current_bee_percentage],
+        y=[0],
+        z=[current_crop],
+        mode='markers',
+        marker=marker,
+        name='Punto Actual'
+    )
+    
+    # Animation frames moving the marker along the time axis
+    frames = [
+        dict(
+            data=[dict(type='scatter3d', x=[current_bee_percentage], y=[year], z=[crop],
+                       mode='markers', marker=marker)],
+            name=f'Year {year:.1f}'
+        )
+        for year, crop in zip(frame_years, frame_crops)
+    ]
+    
+    return _figure_from_template(template, [current_point], frames)
+
+@memoized(maxsize=1)
+@instrumented()
+def _bee_crop_relationship_template():
+    """
+    Static part of plot_bee_crop_relationship: the production curve,
+    threshold zones and layout.
+    
+    Returns:
+    --------
+    dict
+        Figure dictionary without the current-value marker
     """
     # Generate data points
     bee_percentages = np.arange(0, 101, 1)
-    crop_productions = [calculate_crop_production(p) for p in bee_percentages]
+    crop_productions = calculate_crop_production(bee_percentages)
     
     # Create figure
     fig = go.Figure()
@@ -220,16 +273,6 @@ def plot_bee_crop_relationship(current_bee_percentage):
         line=dict(color='#4CAF50', width=3)
     ))
     
-    # Add point for current value
-    current_crop = calculate_crop_production(current_bee_percentage)
-    fig.add_trace(go.Scatter(
-        x=[current_bee_percentage],
-        y=[current_crop],
-        mode='markers',
-        name='Nivel actual',
-        marker=dict(color='red', size=12, symbol='circle')
-    ))
-    
     # Add threshold lines and areas
     fig.add_shape(
         type="line",
@@ -295,43 +338,71 @@ def plot_bee_crop_relationship(current_bee_percentage):
     fig.update_xaxes(range=[0, 100])
     fig.update_yaxes(range=[0, 105])
     
-    return fig
+    return fig.to_dict()
 
-def plot_biodiversity_impact_3d(bee_percentage, ecosystem_resilience):
+@instrumented()
+def plot_bee_crop_relationship(current_bee_percentage):
     """
-    Create a 3D interactive plot showing biodiversity impact based on
-    bee population percentage and ecosystem resilience.
+    Create an interactive plot showing the relationship between
+    bee population and crop production.
     
     Parameters:
     -----------
-    bee_percentage : float
-        Bee population percentage
-    ecosystem_resilience : float
-        Ecosystem resilience factor
+    current_bee_percentage : float
+        Current bee population percentage to highlight
         
     Returns:
     --------
     plotly.graph_objects.Figure
-        3D interactive plot
+        Interactive plot
     """
-    # Generate a grid of x-y points
-    bee_range = np.linspace(10, 100, 30)
-    resilience_range = np.linspace(0.2, 1.0, 30)
-    bee_grid, resilience_grid = np.meshgrid(bee_range, resilience_range)
-    
-    # Calculate biodiversity for each point on the grid
-    biodiversity_values = np.zeros_like(bee_grid)
-    for i in range(bee_grid.shape[0]):
-        for j in range(bee_grid.shape[1]):
-            biodiversity_values[i, j] = calculate_biodiversity_impact(
-                bee_grid[i, j], resilience_grid[i, j]
-            )
+    # Add point for current value
+    current_crop = calculate_crop_production(current_bee_percentage)
+    current_point = dict(
+        type='scatter',
+        x=[current_bee_percentage],
+        y=[current_crop],
+        mode='markers',
+        name='Nivel actual',
+        marker=dict(color='red', size=12, symbol='circle')
+    )
+    
+    return _figure_from_template(_bee_crop_relationship_template(), [current_point])
+
+@memoized(maxsize=16)
+@instrumented()
+def _biodiversity_surface(resolution=(30, 30), adaptive=False):
+    """
+    Cached core.surfaces.biodiversity_surface().
+    
+    The surface does not depend on the current scenario, so it is computed
+    once per resolution and its arrays are returned read-only.
+    """
+    surface = biodiversity_surface(resolution, adaptive)
+    for values in surface:
+        values.flags.writeable = False
+    return surface
+
+@memoized(maxsize=16)
+@instrumented()
+def _biodiversity_impact_3d_template(resolution=(30, 30), adaptive=False):
+    """
+    Static part of plot_biodiversity_impact_3d: the biodiversity surface
+    and layout.
     
+    Returns:
+    --------
+    dict
+        Figure dictionary without the current-point marker
+    """
+    bee_range, resilience_range, biodiversity_values = _biodiversity_surface(
+        tuple(resolution), adaptive
+    )
     # Create the 3D surface plot
     fig = go.Figure(data=[
         go.Surface(
-            x=bee_grid, 
-            y=resilience_grid, 
+            x=bee_range, 
+            y=resilience_range, 
             z=biodiversity_values,
             colorscale='viridis',
             colorbar=dict(
@@ -343,21 +414,6 @@ def plot_biodiversity_impact_3d(bee_percentage, ecosystem_resilience):
         )
     ])
     
-    # Highlight the current point
-    fig.add_trace(
-        go.Scatter3d(
-            x=[bee_percentage],
-            y=[ecosystem_resilience],
-            z=[calculate_biodiversity_impact(bee_percentage, ecosystem_resilience)],
-            mode='markers',
-            marker=dict(
-                size=8,
-                color='red',
-            ),
-            name='Punto Actual'
-        )
-    )
-    
     # Update layout
     fig.update_layout(
         title='Modelo 3D de Impacto en Biodiversidad',
@@ -377,8 +433,52 @@ def plot_biodiversity_impact_3d(bee_percentage, ecosystem_resilience):
         height=500
     )
     
-    return fig
+    template = fig.to_dict()
+    _encode_surface(template['data'][0], bee_range, resilience_range, biodiversity_values)
+    return template
+
+@instrumented()
+def plot_biodiversity_impact_3d(bee_percentage, ecosystem_resilience, resolution=(30, 30), adaptive=False):
+    """
+    Create a 3D interactive plot showing biodiversity impact based on
+    bee population percentage and ecosystem resilience.
+    
+    Parameters:
+    -----------
+    bee_percentage : float
+        Bee population percentage
+    ecosystem_resilience : float
+        Ecosystem resilience factor
+    resolution : tuple of int
+        Number of surface points along the bee population and resilience axes
+    adaptive : bool
+        Refine the surface grid around the sigmoid inflection
+        
+    Returns:
+    --------
+    plotly.graph_objects.Figure
+        3D interactive plot
+    """
+    # The surface is shared by every scenario; only the marker moves
+    template = _biodiversity_impact_3d_template(tuple(resolution), adaptive)
+    
+    # Highlight the current point
+    current_point = dict(
+        type='scatter3d',
+        x=[bee_percentage],
+        y=[ecosystem_resilience],
+        z=[calculate_biodiversity_impact(bee_percentage, ecosystem_resilience)],
+        mode='markers',
+        marker=dict(
+            size=8,
+            color='red',
+        ),
+        name='Punto Actual'
+    )
+    
+    return _figure_from_template(template, [current_point])
 
+@instrumented()
 def plot_biodiversity_impact(bee_percentage, ecosystem_resilience):
     """
     Create an interactive plot showing the impact on different ecosystems
@@ -410,12 +510,9 @@ def plot_biodiversity_impact(bee_percentage, ecosystem_resilience):
     resilience_modifiers = [1.2, 0.9, 1.1, 0.7, 1.3, 0.5]
     
     # Calculate biodiversity impact for each ecosystem
-    biodiversity_impacts = []
-    for modifier in resilience_modifiers:
-        # Adjust resilience based on ecosystem type, but keep within 0-1 range
-        adjusted_resilience = min(1.0, max(0.0, ecosystem_resilience * modifier))
-        impact = calculate_biodiversity_impact(bee_percentage, adjusted_resilience)
-        biodiversity_impacts.append(impact)
+    # Adjust resilience based on ecosystem type, but keep within 0-1 range
+    adjusted_resilience = np.clip(ecosystem_resilience * np.array(resilience_modifiers), 0.0, 1.0)
+    biodiversity_impacts = calculate_biodiversity_impact(bee_percentage, adjusted_resilience).tolist()
     
     # Create color scale based on impact values
     colors = []
@@ -471,7 +568,8 @@ def plot_biodiversity_impact(bee_percentage, ecosystem_resilience):
     
     return fig
 
-def plot_timeseries_forecast(ecosystem_data):
+@instrumented()
+def plot_timeseries_forecast(ecosystem_data, uncertainty_bands=None):
     """
     Create a time series forecast plot based on ecosystem simulation data.
     
@@ -479,6 +577,10 @@ def plot_timeseries_forecast(ecosystem_data):
     -----------
     ecosystem_data : pd.DataFrame
         Data frame with simulation results
+    uncertainty_bands : pd.DataFrame, optional
+        Percentile bands from uncertainty.run_monte_carlo, with a 'time'
+        column and '<variable>_p<percentile>' columns; the lowest and highest
+        percentiles of each variable are drawn as confidence ribbons
         
     Returns:
     --------
@@ -488,6 +590,39 @@ def plot_timeseries_forecast(ecosystem_data):
     # Create figure
     fig = go.Figure()
     
+    if uncertainty_bands is not None:
+        ribbons = {
+            'biodiversity': ('Biodiversidad', 'rgba(76, 175, 80, 0.2)'),
+            'crop_production': ('Producción agrícola', 'rgba(255, 193, 7, 0.2)'),
+            'wild_plants': ('Plantas silvestres', 'rgba(33, 150, 243, 0.2)')
+        }
+        for variable, (label, fillcolor) in ribbons.items():
+            columns = [column for column in uncertainty_bands.columns if column.startswith(f'{variable}_p')]
+            if not columns:
+                continue
+            columns.sort(key=lambda column: float(column.rsplit('_p', 1)[1]))
+            lower, upper = columns[0], columns[-1]
+            
+            # Upper edge first so the lower edge can fill up to it
+            fig.add_trace(go.Scatter(
+                x=uncertainty_bands['time'],
+                y=uncertainty_bands[upper],
+                mode='lines',
+                line=dict(width=0),
+                hoverinfo='skip',
+                showlegend=False
+            ))
+            fig.add_trace(go.Scatter(
+                x=uncertainty_bands['time'],
+                y=uncertainty_bands[lower],
+                mode='lines',
+                line=dict(width=0),
+                fill='tonexty',
+                fillcolor=fillcolor,
+                name=f"{label} P{lower.rsplit('_p', 1)[1]}-P{upper.rsplit('_p', 1)[1]}",
+                hoverinfo='skip'
+            ))
+    
     # Add lines for each variable
     fig.add_trace(go.Scatter(
         x=ecosystem_data['time'],
@@ -559,80 +694,312 @@ def plot_timeseries_forecast(ecosystem_data):
     
     return fig
 
-def create_risk_map(bee_percentage):
+# Map defaults shared by the risk maps
+MAP_CENTER = [4.5709, -74.2973]
+MAP_ZOOM = 6
+RISK_COLORS = {"Alto": 'red', "Medio": 'orange', "Bajo": 'green'}
+
+# Upper bound on the markers sent to the browser by the viewport layers
+MAX_VIEWPORT_MARKERS = 200
+
+# Screen radius (pixels) of the region circles at no and at full risk. The
+# circles keep their size at every zoom level, so low-risk regions stay
+# visible on the country view; the full-risk size matches the 30 km circles
+# previously drawn at MAP_ZOOM
+RISK_CIRCLE_PIXELS = (4, 12)
+
+def region_popup_html(region, description=True):
     """
-    Create an interactive map showing regions at risk due to pollinator loss in Colombia.
+    HTML details of a region, as shown in the map popups.
     
     Parameters:
     -----------
-    bee_percentage : float
-        Current bee population percentage
+    region : dict
+        Region record
+    description : bool
+        Include the region description
         
     Returns:
     --------
-    folium.Map
-        Interactive map
+    str
+        HTML snippet
     """
-    # Create a base map centered on Colombia
-    m = folium.Map(location=[4.5709, -74.2973], zoom_start=6, tiles='CartoDB positron')
+    description_html = f"<p><strong>Descripción:</strong> {region['description']}</p>" if description else ""
+    return f"""
+        <div style="width: 250px">
+            <h4>{region['name']}</h4>
+            <p><strong>Nivel de riesgo:</strong> {region['risk']}</p>
+            <p><strong>Cultivos principales:</strong> {region['crops']}</p>
+            <p><strong>Dependencia de polinizadores:</strong> {region['dependency']}%</p>
+            {description_html}
+        </div>
+        """
+
+def viewport_bounds(map_state):
+    """
+    Extract the visible bounding box from the value returned by st_folium.
     
-    # Import regions data from data module
-    from data.regions import get_risk_regions
-    colombia_regions = get_risk_regions()
+    Parameters:
+    -----------
+    map_state : dict or None
+        Return value of streamlit_folium.st_folium
+        
+    Returns:
+    --------
+    tuple of float or None
+        (south, west, north, east) in degrees, or None before the first render
+    """
+    bounds = (map_state or {}).get('bounds') or {}
+    south_west = bounds.get('_southWest') or {}
+    north_east = bounds.get('_northEast') or {}
+    if south_west.get('lat') is None or north_east.get('lat') is None:
+        return None
+    return (south_west['lat'], south_west['lng'], north_east['lat'], north_east['lng'])
+
+def click_search_distance(zoom=None):
+    """
+    Distance from a map click within which it hits a region circle.
     
-    # Adjust risk based on current bee population
-    # Lower bee population = higher risk
-    risk_multiplier = max(0.1, (100 - bee_percentage) / 100 * 2)
+    Parameters:
+    -----------
+    zoom : int, optional
+        Zoom level returned by st_folium (default MAP_ZOOM)
+        
+    Returns:
+    --------
+    float
+        Largest circle radius of RISK_CIRCLE_PIXELS in degrees at that zoom,
+        for RegionStore.nearest
+    """
+    # Web Mercator: 256 pixels span 360 degrees of longitude at zoom 0; a
+    # degree of latitude is no longer than that near the equator
+    degrees_per_pixel = 360 / (256 * 2 ** (zoom if zoom is not None else MAP_ZOOM))
+    return RISK_CIRCLE_PIXELS[1] * degrees_per_pixel
+
+def select_viewport_regions(store, bounds=None, risk=None, min_dependency=None,
+                            max_markers=MAX_VIEWPORT_MARKERS):
+    """
+    Regions to draw for the current viewport.
     
-    # Add markers for each region
-    for region in colombia_regions:
-        name = region["name"]
-        lat = region["lat"]
-        lon = region["lon"]
-        risk_level = region["risk"]
-        crops = region["crops"]
-        dependency = region["dependency"]
-        description = region["description"]
+    When more than `max_markers` regions match, only the ones with the
+    highest pollinator dependency are kept, so the map size stays bounded.
+    
+    Parameters:
+    -----------
+    store : region_store.RegionStore
+        Indexed regions
+    bounds : tuple of float, optional
+        (south, west, north, east) viewport; None selects the whole store
+    risk : iterable of str, optional
+        Risk levels to keep
+    min_dependency : float, optional
+        Minimum pollinator dependency (%)
+    max_markers : int
+        Maximum number of regions returned
         
-        # Determine color based on risk level
-        if risk_level == "Alto":
-            color = 'red'
-        elif risk_level == "Medio":
-            color = 'orange'
-        else:
-            color = 'green'
-            
-        # Create tooltip and popup content
-        tooltip = f"{name} - Riesgo: {risk_level}"
-        popup_content = f"""
-        <div style="width: 250px">
-            <h4>{name}</h4>
-            <p><strong>Nivel de riesgo:</strong> {risk_level}</p>
-            <p><strong>Cultivos principales:</strong> {crops}</p>
-            <p><strong>Dependencia de polinizadores:</strong> {dependency}%</p>
-            <p><strong>Descripción:</strong> {description}</p>
-        </div>
-        """
+    Returns:
+    --------
+    tuple
+        (list of region records, number of regions matching the filters)
+    """
+    rows = store.query(risk=risk, min_dependency=min_dependency, bounds=bounds)
+    total = len(rows)
+    if total > max_markers:
+        keep = np.argpartition(-store.dependency[rows], max_markers - 1)[:max_markers]
+        rows = np.sort(rows[keep])
+    return store.select(rows), total
+
+# Columns of the region records carried as GeoJSON feature properties
+REGION_PROPERTIES = ['name', 'risk', 'crops', 'dependency', 'description']
+
+def regions_feature_collection(regions, radius, properties=REGION_PROPERTIES):
+    """
+    GeoJSON FeatureCollection of region points.
+    
+    Parameters:
+    -----------
+    regions : list of dict
+        Region records
+    radius : callable
+        Function of a region record returning the circle radius in pixels,
+        stored in the 'radius' property
+    properties : list of str
+        Record fields copied into the feature properties; the risk color is
+        always added as 'color'
+        
+    Returns:
+    --------
+    dict
+        FeatureCollection with one Point feature per region
+    """
+    return {
+        "type": "FeatureCollection",
+        "features": [
+            {
+                "type": "Feature",
+                "geometry": {"type": "Point", "coordinates": [region['lon'], region['lat']]},
+                "properties": {
+                    **{name: region[name] for name in properties},
+                    "color": RISK_COLORS.get(region['risk'], 'green'),
+                    "radius": radius(region)
+                }
+            }
+            for region in regions
+        ]
+    }
+
+def _risk_style(feature):
+    """
+    Shared style of the region circles. It is the same for every feature, so
+    folium emits it once; color and radius come from the feature properties.
+    """
+    return {'fillOpacity': 0.2, 'opacity': 0.6, 'weight': 1}
+
+# Circle color and radius from the feature properties, applied in the browser
+_FEATURE_STYLE_JS = """
+function (feature, layer) {
+    layer.setStyle({color: feature.properties.color, fillColor: feature.properties.color});
+    layer.setRadius(feature.properties.radius);
+}
+"""
+
+# Colored leaf marker with a tooltip for each [lat, lon, name, risk, color] row
+_CLUSTER_MARKER_JS = """
+function (row) {
+    var icon = L.AwesomeMarkers.icon({icon: 'leaf', prefix: 'fa', markerColor: row[4]});
+    var marker = L.marker(new L.LatLng(row[0], row[1]), {icon: icon});
+    marker.bindTooltip(row[2] + ' - Riesgo: ' + row[3]);
+    return marker;
+}
+"""
+
+@instrumented()
+def risk_marker_layer(regions, radius, popups=True, clustered=False, name="Regiones"):
+    """
+    Feature group drawing every region as a risk-colored circle.
+    
+    All regions are emitted as a single GeoJSON FeatureCollection styled by
+    one style function, with one tooltip (and popup) template reading the
+    feature properties, instead of separate Marker, Circle and Popup
+    objects with their own HTML for every region.
+    
+    Parameters:
+    -----------
+    regions : list of dict
+        Region records
+    radius : callable
+        Function of a region record returning the circle radius in pixels
+    popups : bool
+        Attach the popup template. Without popups only the tooltip is sent
+        and the details are loaded on click (see region_popup_html and
+        RegionStore.nearest).
+    clustered : bool
+        Draw leaf markers grouped in a FastMarkerCluster instead of circles
+    name : str
+        Layer name
         
-        # Add marker with popup
-        folium.Marker(
-            location=[lat, lon],
-            popup=folium.Popup(popup_content, max_width=300),
-            tooltip=tooltip,
-            icon=folium.Icon(color=color, icon='leaf', prefix='fa')
-        ).add_to(m)
+    Returns:
+    --------
+    folium.FeatureGroup
+        The layer
+    """
+    import folium
+    from folium.plugins import FastMarkerCluster
+    
+    if clustered:
+        layer = folium.FeatureGroup(name=name)
+        # One data array and one JS callback instead of a Marker object per region
+        FastMarkerCluster(
+            [[region['lat'], region['lon'], region['name'], region['risk'],
+              RISK_COLORS.get(region['risk'], 'green')] for region in regions],
+            callback=_CLUSTER_MARKER_JS
+        ).add_to(layer)
+        return layer
+    
+    if not regions:
+        return folium.FeatureGroup(name=name)
+    
+    return risk_feature_layer(
+        regions_feature_collection(regions, radius, REGION_PROPERTIES if popups else ['name', 'risk']),
+        popups=popups, name=name
+    )
+
+def risk_feature_layer(feature_collection, popups=True, name="Regiones"):
+    """
+    Feature group drawing a regions_feature_collection as risk-colored circles.
+    
+    The collection can be cached and shared: folium only reads it, and a
+    new layer is built around it on every call.
+    
+    Parameters:
+    -----------
+    feature_collection : dict
+        Result of regions_feature_collection
+    popups : bool
+        Attach the popup template; the collection must then carry every
+        field of REGION_PROPERTIES
+    name : str
+        Layer name
         
-        # Add circle with radius proportional to risk
-        adjusted_risk = min(1.0, (dependency/100) * risk_multiplier)
-        folium.Circle(
-            radius=adjusted_risk * 30000,  # Scale for visibility
-            location=[lat, lon],
-            color=color,
-            fill=True,
-            fill_opacity=0.2,
-            opacity=0.6,
-            weight=1
-        ).add_to(m)
+    Returns:
+    --------
+    folium.FeatureGroup
+        The layer
+    """
+    import folium
+    from folium.utilities import JsCode
+    
+    layer = folium.FeatureGroup(name=name)
+    folium.GeoJson(
+        feature_collection,
+        marker=folium.CircleMarker(radius=0, fill=True),
+        style_function=_risk_style,
+        on_each_feature=JsCode(_FEATURE_STYLE_JS),
+        tooltip=folium.GeoJsonTooltip(fields=['name', 'risk'], aliases=['Región', 'Riesgo']),
+        popup=folium.GeoJsonPopup(
+            fields=REGION_PROPERTIES,
+            aliases=['Región', 'Nivel de riesgo', 'Cultivos principales', 'Dependencia de polinizadores (%)', 'Descripción'],
+            max_width=300
+        ) if popups else None,
+        name=name
+    ).add_to(layer)
+    
+    return layer
+
+def dependency_circle_radius(region):
+    """Circle radius in pixels proportional to the pollinator dependency of a region."""
+    min_pixels, max_pixels = RISK_CIRCLE_PIXELS
+    return round(min_pixels + region['dependency'] / 100 * (max_pixels - min_pixels), 1)
+
+def _risk_circle_radius(bee_percentage):
+    """
+    Circle radius of create_risk_map in pixels: dependency scaled by the
+    bee loss, between the bounds of RISK_CIRCLE_PIXELS.
+    """
+    # Lower bee population = higher risk
+    risk_multiplier = max(0.1, (100 - bee_percentage) / 100 * 2)
+    min_pixels, max_pixels = RISK_CIRCLE_PIXELS
+    
+    def radius(region):
+        adjusted_risk = min(1.0, (region['dependency'] / 100) * risk_multiplier)
+        return round(min_pixels + adjusted_risk * (max_pixels - min_pixels), 1)
+    
+    return radius
+
+@instrumented()
+def create_risk_base_map():
+    """
+    Base map of create_risk_map without the region markers.
+    
+    Returns:
+    --------
+    folium.Map
+        Map with the country outline, legend and title
+    """
+    import folium
+    
+    # Create a base map centered on Colombia
+    m = folium.Map(location=MAP_CENTER, zoom_start=MAP_ZOOM, tiles='CartoDB positron')
     
     # Add a Choropleth map layer for Colombia departments (simplified)
     folium.GeoJson(
@@ -690,3 +1057,60 @@ def create_risk_map(bee_percentage):
     m.get_root().html.add_child(folium.Element(title_html))
     
     return m
+
+@instrumented()
+def risk_overlay_features(bee_percentage, bounds=None, max_markers=MAX_VIEWPORT_MARKERS):
+    """
+    Features of the viewport layer of create_risk_map, with lazily loaded popups.
+    
+    Only the regions inside `bounds` are included (at most `max_markers`),
+    and features only carry the tooltip fields instead of the popup ones,
+    so the size of the layer does not grow with the dataset. Draw them
+    with risk_feature_layer(features, popups=False).
+    
+    Parameters:
+    -----------
+    bee_percentage : float
+        Current bee population percentage
+    bounds : tuple of float, optional
+        (south, west, north, east) viewport, see viewport_bounds
+    max_markers : int
+        Maximum number of markers
+        
+    Returns:
+    --------
+    tuple
+        (GeoJSON FeatureCollection, number of regions drawn, number of regions in the viewport)
+    """
+    from cache import cached_region_store
+    regions, total = select_viewport_regions(cached_region_store(), bounds, max_markers=max_markers)
+    features = regions_feature_collection(regions, _risk_circle_radius(bee_percentage), ['name', 'risk'])
+    return features, len(regions), total
+
+@instrumented()
+def create_risk_map(bee_percentage, bounds=None):
+    """
+    Create an interactive map showing regions at risk due to pollinator loss in Colombia.
+    
+    Parameters:
+    -----------
+    bee_percentage : float
+        Current bee population percentage
+    bounds : tuple of float, optional
+        (south, west, north, east) bounding box; only regions inside it are drawn
+        
+    Returns:
+    --------
+    folium.Map
+        Interactive map
+    """
+    m = create_risk_base_map()
+    
+    # Regions data from the indexed region store
+    from cache import cached_region_store
+    colombia_regions = cached_region_store().filter(bounds=bounds)
+    
+    # Add markers with popups and risk circles for each region
+    risk_marker_layer(colombia_regions, _risk_circle_radius(bee_percentage)).add_to(m)
+    
+    return m